@@ -24,6 +24,53 @@ class Chat(ActivatorModel, TimeStampedModel):
     class Meta:
         verbose_name = "Chat"
         verbose_name_plural = "Chats"
+        indexes = [
+            models.Index(
+                fields=["user", "status", "-created", "-id"],
+                name="chat_user_status_created_idx",
+            ),
+        ]
+
+class ChatArchive(models.Model):
+    """
+    Archived chat messages. Rows keep their chat id and are keyed by
+    (`id`, `partition_month`), the first day of the month the message was
+    created in, so the primary key carries the PostgreSQL range partition key
+    (requires Django 5.2 composite primary keys).
+    """
+
+    pk = models.CompositePrimaryKey("id", "partition_month")
+    id = models.BigIntegerField(verbose_name=_("ID"))
+    partition_month = models.DateField(verbose_name=_("Partition Month"))
+    uuid = models.UUIDField(null=True, blank=True, verbose_name=_("UUID"))
+    message = models.CharField(
+        max_length=255, null=True, blank=True, verbose_name=_("Message")
+    )
+    user = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="archived_chats",
+        verbose_name="User",
+    )
+    status = models.IntegerField(verbose_name=_("Status"))
+    created = models.DateTimeField(verbose_name=_("Created"))
+    modified = models.DateTimeField(verbose_name=_("Modified"))
+    archived = models.DateTimeField(auto_now_add=True, verbose_name=_("Archived"))
+
+    class Meta:
+        verbose_name = "Chat Archive"
+        verbose_name_plural = "Chat Archives"
+        indexes = [
+            models.Index(
+                fields=["partition_month", "user", "-created"],
+                name="chat_archive_month_user_idx",
+            ),
+            models.Index(
+                fields=["user", "-created", "-id"], name="chat_archive_user_idx"
+            ),
+        ]
 
 # serializers.py
 from rest_framework import serializers
@@ -40,27 +87,371 @@ class ChatSerializer(serializers.ModelSerializer):
         model = Chat
         fields = ["id", "user", "message", "created"]
 
+class ChatSearchSerializer(ChatSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(ChatSerializer.Meta):
+        fields = ChatSerializer.Meta.fields + ["rank"]
+
+class ChatArchiveSerializer(serializers.ModelSerializer):
+    user = UserResponseSerializer()
+
+    class Meta:
+        model = ChatArchive
+        fields = ["id", "user", "message", "created", "archived"]
+
+class ChatBulkItemSerializer(serializers.Serializer):
+    uuid = serializers.UUIDField(required=False, allow_null=True)
+    user = serializers.IntegerField()
+    message = serializers.CharField(
+        max_length=255, required=False, allow_null=True, allow_blank=True
+    )
+
+
+# archive.py
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+CHAT_ARCHIVE_AFTER_DAYS = 180
+CHAT_ARCHIVE_CHUNK_SIZE = 5000
+
+def archive_chats(days=CHAT_ARCHIVE_AFTER_DAYS, chunk_size=CHAT_ARCHIVE_CHUNK_SIZE):
+    """
+    Function to move inactive chats and chats older than `days` days into the
+    archive table, one chunk per transaction.
+
+    params:
+        days: int: age after which active chats are archived.
+        chunk_size: int: rows moved per transaction.
+
+    return:
+        int: number of archived chats.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    candidates = Chat.objects.filter(
+        ~Q(status=ActivatorModel.ACTIVE_STATUS) | Q(created__lt=cutoff)
+    ).order_by("id")
+
+    archived = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                candidates.select_for_update(skip_locked=True).values(
+                    "id", "uuid", "message", "user_id", "status", "created", "modified"
+                )[:chunk_size]
+            )
+            if not rows:
+                break
+
+            chat_ids = [row["id"] for row in rows]
+            ChatArchive.objects.bulk_create(
+                [
+                    ChatArchive(
+                        partition_month=row["created"].date().replace(day=1),
+                        **row,
+                    )
+                    for row in rows
+                ]
+            )
+            Chat.objects.filter(id__in=chat_ids).delete()
+        archived += len(rows)
+    return archived
+
+# management/commands/archive_chats.py
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Move inactive and old chat messages into the chat archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=CHAT_ARCHIVE_AFTER_DAYS)
+        parser.add_argument(
+            "--chunk-size", type=int, default=CHAT_ARCHIVE_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_chats(options["days"], options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} chats."))
+
+# search.py
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+CHAT_FTS_TABLE = "chat_message_fts"
+CHAT_SEARCH_CONFIG = "english"
+
+def chat_search_setup_sql() -> list:
+    """
+    Statements creating the chat full-text index for the current database:
+    a GIN expression index on PostgreSQL, an external-content FTS5 table kept
+    in sync by triggers on SQLite.
+    """
+    table = Chat._meta.db_table
+    if connection.vendor == "postgresql":
+        return [
+            f"CREATE INDEX IF NOT EXISTS chat_message_search_idx ON {table} "
+            f"USING GIN (to_tsvector('{CHAT_SEARCH_CONFIG}', "
+            f"COALESCE(message, '')))"
+        ]
+    if connection.vendor == "sqlite":
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {CHAT_FTS_TABLE} USING fts5("
+            f"message, content='{table}', content_rowid='id')",
+            f"CREATE TRIGGER IF NOT EXISTS {CHAT_FTS_TABLE}_ai AFTER INSERT ON "
+            f"{table} BEGIN INSERT INTO {CHAT_FTS_TABLE}(rowid, message) "
+            f"VALUES (new.id, new.message); END",
+            f"CREATE TRIGGER IF NOT EXISTS {CHAT_FTS_TABLE}_ad AFTER DELETE ON "
+            f"{table} BEGIN INSERT INTO {CHAT_FTS_TABLE}({CHAT_FTS_TABLE}, rowid, "
+            f"message) VALUES ('delete', old.id, old.message); END",
+            f"CREATE TRIGGER IF NOT EXISTS {CHAT_FTS_TABLE}_au AFTER UPDATE OF "
+            f"message ON {table} BEGIN INSERT INTO {CHAT_FTS_TABLE}("
+            f"{CHAT_FTS_TABLE}, rowid, message) VALUES ('delete', old.id, "
+            f"old.message); INSERT INTO {CHAT_FTS_TABLE}(rowid, message) "
+            f"VALUES (new.id, new.message); END",
+            f"INSERT INTO {CHAT_FTS_TABLE}({CHAT_FTS_TABLE}) VALUES ('rebuild')",
+        ]
+    return []
+
+def search_chats(queryset, query: str):
+    """
+    Function to filter a Chat queryset by a full-text query and order it by
+    relevance.
+
+    params:
+        queryset: Chat queryset.
+        query: str: user supplied search text.
+
+    return:
+        queryset: Chat queryset annotated with `rank`, best match first.
+    """
+    chat_id = f'"{Chat._meta.db_table}"."id"'
+    if connection.vendor == "postgresql":
+        vector = (
+            f"to_tsvector('{CHAT_SEARCH_CONFIG}', "
+            f"COALESCE(\"{Chat._meta.db_table}\".\"message\", ''))"
+        )
+        tsquery = f"websearch_to_tsquery('{CHAT_SEARCH_CONFIG}', %s)"
+        rank = RawSQL(f"ts_rank({vector}, {tsquery})", (query,), FloatField())
+        match = RawSQL(f"{vector} @@ {tsquery}", (query,), BooleanField())
+    else:
+        # FTS5 MATCH syntax; quote the input so it is searched as plain terms
+        terms = " ".join(
+            '"{}"'.format(term.replace('"', '""')) for term in query.split()
+        )
+        rank = RawSQL(
+            f"(SELECT -bm25({CHAT_FTS_TABLE}) FROM {CHAT_FTS_TABLE} "
+            f"WHERE {CHAT_FTS_TABLE} MATCH %s AND rowid = {chat_id})",
+            (terms,),
+            FloatField(),
+        )
+        match = RawSQL(
+            f"{chat_id} IN (SELECT rowid FROM {CHAT_FTS_TABLE} "
+            f"WHERE {CHAT_FTS_TABLE} MATCH %s)",
+            (terms,),
+            BooleanField(),
+        )
+
+    return (
+        queryset.annotate(rank=rank)
+        .filter(match)
+        .order_by("-rank", "-created", "-id")
+    )
+
+# management/commands/setup_chat_search.py
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Create the full-text index used by chat history search."
+
+    def handle(self, *args, **options):
+        statements = chat_search_setup_sql()
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+        self.stdout.write(
+            self.style.SUCCESS(f"Ran {len(statements)} chat search statements.")
+        )
+
+# bulk_delete.py
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import Subquery
+from django.utils import timezone
+
+CHAT_DELETE_CHUNK_SIZE = 5000
+
+def _day_start(value) -> datetime:
+    if not isinstance(value, str):
+        raise ValueError(value)
+    return timezone.make_aware(datetime.combine(date.fromisoformat(value), time.min))
+
+def created_range(params) -> dict:
+    """
+    Function to build `created` bounds from the created_after and
+    created_before dates (both inclusive) as aware datetimes, so the
+    (user, status, created) index serves the range.
+
+    params:
+        params: dict: query params or request body.
+
+    return:
+        dict: `created` lookups, raising ValueError for a body that is not an
+        object or dates that are not ISO formatted strings.
+    """
+    if not isinstance(params, dict):
+        raise ValueError(params)
+
+    lookups = {}
+    if params.get("created_after"):
+        lookups["created__gte"] = _day_start(params["created_after"])
+    if params.get("created_before"):
+        lookups["created__lt"] = _day_start(params["created_before"]) + timedelta(
+            days=1
+        )
+    return lookups
+
+def clear_chats(queryset, deactivate=False, chunk_size=CHAT_DELETE_CHUNK_SIZE) -> int:
+    """
+    Function to delete or deactivate the chats matched by a queryset in
+    chunked set-based statements, without loading rows into Python.
+
+    params:
+        queryset: Chat or ChatArchive queryset.
+        deactivate: bool: soft-deactivate instead of deleting.
+        chunk_size: int: rows per statement.
+
+    return:
+        int: number of affected chats.
+    """
+    model = queryset.model
+    if deactivate:
+        queryset = queryset.filter(status=ActivatorModel.ACTIVE_STATUS)
+
+    affected = 0
+    while True:
+        chunk = model.objects.filter(
+            id__in=Subquery(queryset.order_by("id").values("id")[:chunk_size])
+        )
+        if deactivate:
+            now = timezone.now()
+            changes = {"status": ActivatorModel.INACTIVE_STATUS, "modified": now}
+            if model is Chat:
+                changes["deactivate_date"] = now
+            count = chunk.update(**changes)
+        else:
+            count, _ = chunk.delete()
+        if not count:
+            return affected
+        affected += count
+
+# export.py
+import csv
+import heapq
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+CHAT_EXPORT_CHUNK_SIZE = 2000
+CHAT_EXPORT_FIELDS = ["id", "uuid", "user", "message", "created"]
+
+class Echo:
+    """
+    File-like object whose write returns the value, so csv.writer rows can be
+    yielded straight into a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+def export_chat_rows(*querysets):
+    """
+    Function to stream rows of several querysets ordered by (created, id),
+    such as live and archived chats, merged into one (created, id) order.
+    """
+    return heapq.merge(
+        *(
+            queryset.order_by("created", "id")
+            .values_list("id", "uuid", "user_id", "message", "created")
+            .iterator(chunk_size=CHAT_EXPORT_CHUNK_SIZE)
+            for queryset in querysets
+        ),
+        key=lambda row: (row[4], row[0]),
+    )
+
+def stream_chats_ndjson(*querysets):
+    for row in export_chat_rows(*querysets):
+        yield json.dumps(dict(zip(CHAT_EXPORT_FIELDS, row)), cls=DjangoJSONEncoder)
+        yield "\n"
+
+def stream_chats_csv(*querysets):
+    writer = csv.writer(Echo())
+    yield writer.writerow(CHAT_EXPORT_FIELDS)
+    for row in export_chat_rows(*querysets):
+        yield writer.writerow(row)
+
+CHAT_EXPORT_FORMATS = {
+    "ndjson": (stream_chats_ndjson, "application/x-ndjson"),
+    "csv": (stream_chats_csv, "text/csv"),
+}
 
 # pagination.py
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 1000
 
+class ChatCursorPagination(CursorPagination):
+    """
+    Keyset pagination on (created, id), so every page is one index range scan
+    with no COUNT(*) and no OFFSET however far back the user scrolls.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    ordering = ("-created", "-id")
+
 # views.py
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+BULK_CREATE_MAX_ITEMS = 10000
+BULK_CREATE_BATCH_SIZE = 1000
+
 class ChatConstantsMessage:
     CHAT_CREATED_SUCCESSFULLY = "Chat deleted successfully."
+    MESSAGES_LIST_REQUIRED = "A list of messages is required."
+    MESSAGES_LIMIT_EXCEEDED = (
+        f"A batch can contain at most {BULK_CREATE_MAX_ITEMS} messages."
+    )
+    USER_NOT_FOUND = "User not found."
+    SEARCH_QUERY_REQUIRED = "The q parameter is required."
+    INVALID_EXPORT_FORMAT = "file_format must be one of: ndjson, csv."
+    IDS_MUST_BE_LIST = "ids must be a list of chat IDs."
+    CHATS_CLEARED_SUCCESSFULLY = "Chats cleared successfully."
+    INVALID_DATE_RANGE = "created_after and created_before must be ISO dates."
+    CHAT_ACCESS_DENIED = "You can only access your own chat history."
+    REQUEST_BODY_MUST_BE_OBJECT = "The request body must be a JSON object."
 
 class ChatHistoryView(viewsets.ModelViewSet):
-    queryset = Chat.objects.filter(status=ActivatorModel.ACTIVE_STATUS).order_by(
-        "-created"
+    queryset = (
+        Chat.objects.filter(status=ActivatorModel.ACTIVE_STATUS)
+        .select_related("user")
+        .order_by("-created", "-id")
     )
     serializer_class = ChatSerializer
     permission_classes = (IsAuthenticated,)
@@ -68,6 +459,236 @@ class ChatHistoryView(viewsets.ModelViewSet):
     filterset_fields = ["id", "user"]
     pagination_class = StandardResultsSetPagination
 
+    def is_archive_request(self) -> bool:
+        return (
+            self.action == "list"
+            and self.request.query_params.get("archived", "").lower() == "true"
+        )
+
+    def get_queryset(self):
+        # ?archived=true lists the archived history with the same filters
+        if self.is_archive_request():
+            # inactive rows were soft-deleted before archiving and stay hidden
+            return (
+                ChatArchive.objects.filter(status=ActivatorModel.ACTIVE_STATUS)
+                .select_related("user")
+                .order_by("-created", "-id")
+            )
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        if self.is_archive_request():
+            return ChatArchiveSerializer
+        return super().get_serializer_class()
+
+    @property
+    def paginator(self):
+        # ?cursor= or ?pagination=cursor switches to keyset pages
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params
+            if "cursor" in params or params.get("pagination") == "cursor":
+                self._paginator = ChatCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def target_user_response(self, user_id: str):
+        """
+        Return an error response unless `user_id` is the requesting user or
+        the requester is staff.
+        """
+        if not user_id.isdigit():
+            return Response(
+                {"message": ChatConstantsMessage.USER_NOT_FOUND},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if int(user_id) != self.request.user.id and not self.request.user.is_staff:
+            return Response(
+                {"message": ChatConstantsMessage.CHAT_ACCESS_DENIED},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return None
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request, *args, **kwargs):
+        params = request.query_params
+        query = params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"message": ChatConstantsMessage.SEARCH_QUERY_REQUIRED},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if "user" in params:
+            error_response = self.target_user_response(params["user"])
+            if error_response:
+                return error_response
+
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **created_range(params)
+            )
+        except ValueError:
+            return Response(
+                {"message": ChatConstantsMessage.INVALID_DATE_RANGE},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # staff search across users; everyone else only their own chats
+        if not request.user.is_staff:
+            queryset = queryset.filter(user=request.user)
+
+        # relevance order cannot be keyset paginated on created
+        self._paginator = StandardResultsSetPagination()
+        page = self.paginate_queryset(search_chats(queryset, query))
+        serializer = ChatSearchSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request, *args, **kwargs):
+        # DRF reserves ?format= for renderer negotiation
+        file_format = request.query_params.get("file_format", "ndjson").lower()
+        if file_format not in CHAT_EXPORT_FORMATS:
+            return Response(
+                {"message": ChatConstantsMessage.INVALID_EXPORT_FORMAT},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user_id = str(request.query_params.get("user", request.user.id))
+        error_response = self.target_user_response(user_id)
+        if error_response:
+            return error_response
+
+        # older history lives in the archive once archive_chats has run
+        querysets = [
+            model.objects.filter(user_id=user_id, status=ActivatorModel.ACTIVE_STATUS)
+            for model in (Chat, ChatArchive)
+        ]
+
+        stream, content_type = CHAT_EXPORT_FORMATS[file_format]
+        response = StreamingHttpResponse(
+            stream(*querysets), content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="chat-history-{user_id}.{file_format}"'
+        )
+        return response
+
+    @action(detail=False, methods=["post"], url_path="clear")
+    def clear(self, request, *args, **kwargs):
+        data = request.data
+        if not isinstance(data, dict):
+            return Response(
+                {"message": ChatConstantsMessage.REQUEST_BODY_MUST_BE_OBJECT},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        user_id = str(data.get("user", request.user.id))
+        ids = data.get("ids")
+        error_response = self.target_user_response(user_id)
+        if error_response:
+            return error_response
+        if ids is not None and not (
+            isinstance(ids, list) and all(str(pk).isdigit() for pk in ids)
+        ):
+            return Response(
+                {"message": ChatConstantsMessage.IDS_MUST_BE_LIST},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            lookups = created_range(data)
+        except ValueError:
+            return Response(
+                {"message": ChatConstantsMessage.INVALID_DATE_RANGE},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if ids is not None:
+            lookups["id__in"] = ids
+
+        # archived chats keep their ids, so the same scope clears them too
+        deactivate = str(data.get("deactivate")).lower() in ("true", "1", "t")
+        affected = sum(
+            clear_chats(
+                model.objects.filter(user_id=user_id, **lookups),
+                deactivate=deactivate,
+            )
+            for model in (Chat, ChatArchive)
+        )
+        return Response(
+            {
+                "message": ChatConstantsMessage.CHATS_CLEARED_SUCCESSFULLY,
+                "count": affected,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        items = request.data.get("messages") if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"message": ChatConstantsMessage.MESSAGES_LIST_REQUIRED},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > BULK_CREATE_MAX_ITEMS:
+            return Response(
+                {"message": ChatConstantsMessage.MESSAGES_LIMIT_EXCEEDED},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        errors = []
+        valid = []
+        for index, item in enumerate(items):
+            serializer = ChatBulkItemSerializer(data=item)
+            if not serializer.is_valid():
+                errors.append({"index": index, "errors": serializer.errors})
+            elif (
+                serializer.validated_data["user"] != request.user.id
+                and not request.user.is_staff
+            ):
+                # only staff (the chatbot backend) write other users' history
+                errors.append(
+                    {
+                        "index": index,
+                        "errors": {"user": [ChatConstantsMessage.CHAT_ACCESS_DENIED]},
+                    }
+                )
+            else:
+                valid.append((index, serializer.validated_data))
+
+        # resolve every referenced user with one query instead of one per item
+        user_ids = set(
+            User.objects.filter(
+                id__in={data["user"] for _, data in valid}
+            ).values_list("id", flat=True)
+        )
+        now = timezone.now()
+        chats = []
+        for index, data in valid:
+            if data["user"] not in user_ids:
+                errors.append(
+                    {
+                        "index": index,
+                        "errors": {"user": [ChatConstantsMessage.USER_NOT_FOUND]},
+                    }
+                )
+                continue
+            chats.append(
+                Chat(
+                    uuid=data.get("uuid"),
+                    user_id=data["user"],
+                    message=data.get("message"),
+                    activate_date=now,
+                )
+            )
+
+        with transaction.atomic():
+            Chat.objects.bulk_create(chats, batch_size=BULK_CREATE_BATCH_SIZE)
+
+        return Response(
+            {"created": len(chats), "errors": sorted(errors, key=lambda e: e["index"])},
+            status=status.HTTP_201_CREATED if chats else status.HTTP_400_BAD_REQUEST,
+        )
+
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         self.perform_destroy(instance)
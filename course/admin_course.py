@@ -1,7 +1,7 @@
 # models.py
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from subscription.user_subscription import Subscription
+from subscription.user_subscription import Subscription, lifetime_duration
 from django_extensions.db.models import ActivatorModel, TimeStampedModel
 from django.contrib.auth import get_user_model
 
@@ -12,6 +12,83 @@ class ProficiencyLevel(models.TextChoices):
     Intermediate = "Intermediate"
     Advance = "Advance"
 
+class TopicManager(models.Manager):
+    def _memoized(self, key: str, build):
+        cache_key = catalog_cache.make_key(
+            catalog_cache.make_etag(catalog_cache.get_version(), key)
+        )
+        value = catalog_cache.get(cache_key)
+        if value is None:
+            value = build()
+            catalog_cache.set(cache_key, value)
+        return value
+
+    def get_tier_subscription_ids(self, duration: int) -> list:
+        """
+        Recurring plans unlocked by a plan duration. Lifetime plans share the
+        duration 0 with no recurring meaning, so they are only unlocked by
+        lifetime membership.
+        """
+        return self._memoized(
+            f"subscriptions:{duration}",
+            lambda: list(
+                Subscription.objects.filter(duration__lte=duration)
+                .exclude(duration=lifetime_duration)
+                .order_by("id")
+                .values_list("id", flat=True)
+            ),
+        )
+
+    def get_tier_topic_ids(
+        self, level: str, duration=None, chapter=None, lifetime_membership=False
+    ) -> list:
+        """
+        Topic ids visible to a (level, plan) tier, per chapter or for the
+        whole level. Users share a handful of tiers, so the ids are memoized
+        in the catalog cache and dropped whenever the catalog version changes.
+        Topics without a plan are free and visible to every tier.
+        """
+        tier = "lifetime" if lifetime_membership else duration
+        chapter_id = chapter.id if chapter is not None else "all"
+
+        def build():
+            # filters follow the (chapter, level, subscription) and
+            # (level, chapter) indexes
+            queryset = self.filter(level=level)
+            if chapter is not None:
+                queryset = queryset.filter(chapter=chapter)
+            if not lifetime_membership:
+                queryset = queryset.filter(
+                    models.Q(subscription__in=self.get_tier_subscription_ids(duration))
+                    | models.Q(subscription__isnull=True)
+                )
+            return list(queryset.order_by("id").values_list("id", flat=True))
+
+        return self._memoized(f"topics:{level}:{tier}:{chapter_id}", build)
+
+    def get_entitled_topics(
+        self, level: str, duration=None, chapter=None, lifetime_membership=False
+    ):
+        """
+        Topics of a level visible to a plan. Lifetime members see every topic,
+        other users free topics and those of recurring plans within their
+        duration, and users without a plan nothing at all.
+        """
+        if not lifetime_membership and duration is None:
+            return self.none()
+        topic_ids = self.get_tier_topic_ids(
+            level, duration, chapter, lifetime_membership
+        )
+        return self.filter(id__in=topic_ids).order_by("id")
+
+    def get_ordered_topics(self, level: str, chapter: object):
+        return self.get_entitled_topics(
+            level, chapter=chapter, lifetime_membership=True
+        )
+
+    def get_subscription_topics(self, level: str, chapter: object, duration: int):
+        return self.get_entitled_topics(level, duration, chapter)
+
 class Chapter(TimeStampedModel):
     name = models.CharField(
         max_length=255, null=True, blank=True, verbose_name=_("Chapter Name")
@@ -49,7 +126,16 @@ class Topics(ActivatorModel):
     example_format = models.CharField(
         max_length=255, null=True, blank=True, verbose_name=_("Example Format")
     )
-    # objects = TopicManager()
+    objects = TopicManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["chapter", "level", "subscription"],
+                name="topic_chapter_level_sub_idx",
+            ),
+            models.Index(fields=["level", "chapter"], name="topic_level_chapter_idx"),
+        ]
 
 class TopicProgress(ActivatorModel, TimeStampedModel):
     user = models.ForeignKey(
@@ -86,6 +172,63 @@ class TopicProgress(ActivatorModel, TimeStampedModel):
 
     class Meta:
         verbose_name = _("Topic Progress")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "topic"], name="unique_topic_progress_user_topic"
+            ),
+        ]
+
+class ProgressAggregateManager(models.Manager):
+    def apply_delta(self, user_id: int, progress=0, count=0) -> None:
+        if not user_id or not (progress or count):
+            return
+        # users without a row yet are filled from TopicProgress on first read
+        self.filter(user_id=user_id).update(
+            progress_sum=models.F("progress_sum") + progress,
+            topic_count=models.F("topic_count") + count,
+        )
+
+    def get_or_fill(self, user_id: int):
+        aggregate = self.filter(user_id=user_id).first()
+        if aggregate is None:
+            totals = TopicProgress.objects.filter(user_id=user_id).aggregate(
+                progress_sum=models.Sum("progress"), topic_count=models.Count("id")
+            )
+            aggregate, _ = self.get_or_create(
+                user_id=user_id,
+                defaults={
+                    "progress_sum": totals["progress_sum"] or 0,
+                    "topic_count": totals["topic_count"],
+                },
+            )
+        return aggregate
+
+class UserProgressAggregate(models.Model):
+    """
+    Running sum and count of a user's TopicProgress.progress, kept current by
+    TopicProgress signals and the answer buffer. Rows are created on first
+    read or by reconcile_progress_aggregates, never by the delta writers.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name="progress_aggregate",
+        verbose_name=_("User"),
+    )
+    progress_sum = models.BigIntegerField(_("Progress Sum"), default=0)
+    topic_count = models.IntegerField(_("Topic Count"), default=0)
+
+    objects = ProgressAggregateManager()
+
+    class Meta:
+        verbose_name = _("User Progress Aggregate")
+
+    @property
+    def average(self) -> int:
+        if not self.topic_count:
+            return 0
+        return int(self.progress_sum / self.topic_count)
 
 # serializers.py
 from rest_framework import serializers
@@ -120,12 +263,13 @@ class TopicSerializer(serializers.ModelSerializer):
 
     def get_progress(self, obj, topic_progress=None):
         if self.context.get("extra_fields"):
-            progress_obj = TopicProgress.objects.filter(
-                topic=obj, user=self.context.get("user")
-            )
-
-            if progress_obj.exists():
-                topic_progress = progress_obj.first()
+            if hasattr(obj, "user_progress"):
+                # progress rows prefetched by chapter_tree_queryset
+                topic_progress = next(iter(obj.user_progress), None)
+            else:
+                topic_progress = TopicProgress.objects.filter(
+                    topic=obj, user=self.context.get("user")
+                ).first()
 
             serializer = TopicProgressSerializer(topic_progress)
             return serializer.data
@@ -140,6 +284,13 @@ class ChapterSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "order", "topics"]
 
     def get_topics(self, obj):
+        if hasattr(obj, "loaded_topics"):
+            # topics prefetched by chapter_tree_queryset
+            serializer = TopicSerializer(
+                obj.loaded_topics, many=True, context=self.context
+            )
+            return serializer.data
+
         if self.context.get("extra_fields"):
             if self.context.get("lifetime_membership"):
                 queryset = Topics.objects.get_ordered_topics(
@@ -157,6 +308,440 @@ class ChapterSerializer(serializers.ModelSerializer):
             serializers = TopicSerializer(topics, many=True, context=self.context)
             return serializers.data
 
+# loaders.py
+from django.db.models import Prefetch
+
+
+def entitled_topics(level: str, duration=None, lifetime_membership=False):
+    """
+    Function to build the topics queryset visible to a user.
+
+    params:
+        level: str: user's proficiency level.
+        duration: int: user's subscription plan duration in months.
+        lifetime_membership: bool: user has a lifetime plan.
+
+    return:
+        queryset: Topics queryset ordered by id.
+    """
+    return Topics.objects.get_entitled_topics(
+        level, duration, lifetime_membership=bool(lifetime_membership)
+    )
+
+
+def chapter_tree_queryset(queryset, context: dict):
+    """
+    Function to attach chapter topics and the requesting user's topic progress
+    to a chapter queryset, so the whole tree loads in three queries however
+    many chapters and topics the course has.
+
+    params:
+        queryset: Chapter queryset.
+        context: dict: serializer context.
+
+    return:
+        queryset: Chapter queryset with `loaded_topics` on every chapter and
+        `user_progress` on every topic.
+    """
+    if context.get("extra_fields"):
+        topics = entitled_topics(
+            context.get("level"),
+            context.get("duration"),
+            context.get("lifetime_membership"),
+        ).prefetch_related(
+            Prefetch(
+                "topic_progress_topic",
+                queryset=TopicProgress.objects.filter(
+                    user=context.get("user")
+                ).order_by("id"),
+                to_attr="user_progress",
+            )
+        )
+    else:
+        topics = Topics.objects.order_by("id")
+
+    return queryset.prefetch_related(
+        Prefetch("chapter_topics", queryset=topics, to_attr="loaded_topics")
+    )
+
+# buffers.py
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+ANSWER_FLUSH_INTERVAL = 5
+ANSWER_FLUSH_THRESHOLD = 500
+
+
+class AnswerBuffer:
+    """
+    Write-behind buffer for TopicProgress answer counters. Answers are summed
+    in memory per (user, topic) and written as F() increments, so a quiz
+    session costs a few UPDATE statements instead of one row save per answer.
+
+    The buffer is per process and best effort: a background thread flushes it
+    every `flush_interval` seconds and at exit, but counters still pending
+    when a process is killed are lost.
+    """
+
+    def __init__(
+        self, flush_interval=ANSWER_FLUSH_INTERVAL, threshold=ANSWER_FLUSH_THRESHOLD
+    ):
+        self.flush_interval = flush_interval
+        self.threshold = threshold
+        self._pending = defaultdict(lambda: [0, 0, 0])
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flusher_pid = None
+
+    def start(self) -> None:
+        """
+        Start the periodic flush thread, once per process (forked workers
+        don't inherit the parent's thread).
+        """
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(
+            target=self._run, name="answer-buffer-flush", daemon=True
+        ).start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                # counters were put back by flush() and go out with the next one
+                logger.exception("Flushing buffered topic answers failed.")
+            finally:
+                close_old_connections()
+
+    def record(self, user_id: int, topic_id: int, correct: bool, progress=0) -> None:
+        self.start()
+        with self._lock:
+            counters = self._pending[(user_id, topic_id)]
+            counters[0 if correct else 1] += 1
+            counters[2] += progress
+            due = (
+                len(self._pending) >= self.threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self, user_id=None) -> int:
+        """
+        Write buffered counters to the database.
+
+        params:
+            user_id: int: flush only this user's counters, default all users.
+
+        return:
+            int: number of (user, topic) counters written.
+        """
+        with self._lock:
+            if user_id is None:
+                pending, self._pending = self._pending, defaultdict(lambda: [0, 0, 0])
+                self._last_flush = time.monotonic()
+            else:
+                pending = {
+                    key: self._pending.pop(key)
+                    for key in list(self._pending)
+                    if key[0] == user_id
+                }
+
+        if not pending:
+            return 0
+
+        # one UPDATE per (user, deltas) group; quiz answers mostly share deltas
+        groups = defaultdict(list)
+        for (user, topic), counters in pending.items():
+            groups[(user, *counters)].append(topic)
+
+        try:
+            aggregate_deltas = self._write(pending, groups)
+        except Exception:
+            self._restore(pending)
+            raise
+
+        topic_progress_flushed.send(
+            sender=TopicProgress, user_ids=list(aggregate_deltas)
+        )
+        return len(pending)
+
+    def _write(self, pending, groups) -> dict:
+        # bulk_create and update() skip signals, so the aggregate is kept here
+        aggregate_deltas = defaultdict(lambda: [0, 0])
+
+        topics_by_user = self._group_topics(pending)
+        with transaction.atomic():
+            # lock the users so concurrent flushes agree on which rows are new
+            list(
+                User.objects.select_for_update()
+                .filter(id__in=topics_by_user)
+                .order_by("id")
+                .values_list("id", flat=True)
+            )
+            for user, topics in topics_by_user.items():
+                existing = set(
+                    TopicProgress.objects.filter(
+                        user_id=user, topic_id__in=topics
+                    ).values_list("topic_id", flat=True)
+                )
+                missing = [
+                    TopicProgress(user_id=user, topic_id=topic)
+                    for topic in topics
+                    if topic not in existing
+                ]
+                # rows created outside the buffer meanwhile are skipped
+                TopicProgress.objects.bulk_create(missing, ignore_conflicts=True)
+                aggregate_deltas[user][1] += len(missing)
+
+            for (user, correct, wrong, progress), topics in groups.items():
+                updated = TopicProgress.objects.filter(
+                    user_id=user, topic_id__in=topics
+                ).update(
+                    total_correct_answers=F("total_correct_answers") + correct,
+                    total_wrong_answers=F("total_wrong_answers") + wrong,
+                    progress=F("progress") + progress,
+                )
+                aggregate_deltas[user][0] += progress * updated
+
+            for user, (progress, count) in aggregate_deltas.items():
+                UserProgressAggregate.objects.apply_delta(user, progress, count)
+        return aggregate_deltas
+
+    def _restore(self, pending) -> None:
+        # merge into counters recorded while the failed flush was running
+        with self._lock:
+            for key, counters in pending.items():
+                current = self._pending[key]
+                for index, value in enumerate(counters):
+                    current[index] += value
+
+    def _group_topics(self, pending) -> dict:
+        topics = defaultdict(list)
+        for user, topic in pending:
+            topics[user].append(topic)
+        return topics
+
+
+answer_buffer = AnswerBuffer()
+atexit.register(answer_buffer.flush)
+
+
+def record_answer(user: object, topic: object, correct: bool, progress=0) -> None:
+    """
+    Function to record a submitted answer against the user's topic progress.
+
+    params:
+        user: object: User object.
+        topic: object: Topics object.
+        correct: bool: the answer was correct.
+        progress: int: progress gained by the answer, default 0
+
+    return:
+        None
+    """
+    answer_buffer.record(user.id, topic.id, correct, progress)
+
+
+def end_quiz_session(user: object) -> int:
+    """
+    Function to write a user's buffered answers when their quiz session ends.
+    Only answers buffered by this process are written; other workers flush
+    theirs on their own timer.
+    """
+    return answer_buffer.flush(user.id)
+
+# cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = "course:catalog:version"
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class CatalogCache:
+    """
+    Two-tier cache for the chapter/topic catalog. A per-process LRU sits in
+    front of Django's cache backend and every key carries the catalog content
+    version, so bumping the version invalidates both tiers at once.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _seed_version(self) -> int:
+        # an evicted version restarts from the clock, never from a value whose
+        # entries and ETags may still be cached
+        cache.add(CATALOG_VERSION_KEY, time.time_ns() // 1000, timeout=None)
+        return cache.get(CATALOG_VERSION_KEY)
+
+    def get_version(self) -> int:
+        version = cache.get(CATALOG_VERSION_KEY)
+        if version is None:
+            version = self._seed_version()
+        return version
+
+    def bump_version(self) -> int:
+        try:
+            version = cache.incr(CATALOG_VERSION_KEY)
+        except ValueError:
+            self._seed_version()
+            version = cache.incr(CATALOG_VERSION_KEY)
+        with self._lock:
+            self._entries.clear()
+        return version
+
+    def make_etag(self, version: int, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return f"{version}-{digest}"
+
+    def make_key(self, etag: str) -> str:
+        return f"course:catalog:{etag}"
+
+    def get(self, cache_key: str):
+        with self._lock:
+            if cache_key in self._entries:
+                self._entries.move_to_end(cache_key)
+                return self._entries[cache_key]
+
+        data = cache.get(cache_key)
+        if data is not None:
+            self._remember(cache_key, data)
+        return data
+
+    def set(self, cache_key: str, data) -> None:
+        cache.set(cache_key, data, timeout=CATALOG_CACHE_TIMEOUT)
+        self._remember(cache_key, data)
+
+    def _remember(self, cache_key: str, data) -> None:
+        with self._lock:
+            self._entries[cache_key] = data
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+catalog_cache = CatalogCache()
+
+# signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import Signal, receiver
+
+# sent after the answer buffer writes TopicProgress rows without model signals
+topic_progress_flushed = Signal()
+
+
+@receiver([post_save, post_delete], sender=Chapter)
+@receiver([post_save, post_delete], sender=Topics)
+@receiver([post_save, post_delete], sender=Subscription)
+def invalidate_catalog_cache(sender, **kwargs):
+    # bumped after commit so a concurrent read can't re-cache the old rows
+    transaction.on_commit(catalog_cache.bump_version)
+
+
+@receiver(post_init, sender=TopicProgress)
+def remember_topic_progress(sender, instance, **kwargs):
+    if "progress" not in instance.get_deferred_fields():
+        instance._saved_progress = instance.progress
+        instance._saved_user_id = instance.user_id
+
+
+@receiver(post_save, sender=TopicProgress)
+def update_progress_aggregate(sender, instance, created, **kwargs):
+    saved_progress = getattr(instance, "_saved_progress", None)
+    saved_user_id = getattr(instance, "_saved_user_id", None)
+
+    if created:
+        UserProgressAggregate.objects.apply_delta(
+            instance.user_id, instance.progress, 1
+        )
+    elif saved_progress is None:
+        # loaded with progress deferred, so the drift is left to reconciliation
+        return
+    elif saved_user_id != instance.user_id:
+        UserProgressAggregate.objects.apply_delta(saved_user_id, -saved_progress, -1)
+        UserProgressAggregate.objects.apply_delta(
+            instance.user_id, instance.progress, 1
+        )
+    else:
+        UserProgressAggregate.objects.apply_delta(
+            instance.user_id, instance.progress - saved_progress
+        )
+
+    instance._saved_progress = instance.progress
+    instance._saved_user_id = instance.user_id
+
+
+@receiver(post_delete, sender=TopicProgress)
+def remove_from_progress_aggregate(sender, instance, **kwargs):
+    UserProgressAggregate.objects.apply_delta(
+        instance.user_id, -instance.progress, -1
+    )
+
+# management/commands/reconcile_progress_aggregates.py
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Sum
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's progress aggregate from TopicProgress."
+
+    def handle(self, *args, **options):
+        totals = {
+            row["user"]: (row["progress_sum"] or 0, row["topic_count"])
+            for row in TopicProgress.objects.filter(user__isnull=False)
+            .values("user")
+            .annotate(progress_sum=Sum("progress"), topic_count=Count("id"))
+            .order_by()
+        }
+
+        drifted = []
+        for aggregate in UserProgressAggregate.objects.all().iterator():
+            expected = totals.pop(aggregate.user_id, (0, 0))
+            if (aggregate.progress_sum, aggregate.topic_count) != expected:
+                aggregate.progress_sum, aggregate.topic_count = expected
+                drifted.append(aggregate)
+
+        UserProgressAggregate.objects.bulk_update(
+            drifted, ["progress_sum", "topic_count"], batch_size=1000
+        )
+        missing = UserProgressAggregate.objects.bulk_create(
+            [
+                UserProgressAggregate(
+                    user_id=user, progress_sum=progress_sum, topic_count=topic_count
+                )
+                for user, (progress_sum, topic_count) in totals.items()
+            ],
+            batch_size=1000,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {len(drifted)} drifted and {len(missing)} missing "
+                "progress aggregates."
+            )
+        )
+
 # pagination.py
 from rest_framework.pagination import PageNumberPagination
 
@@ -166,22 +751,76 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 1000
 
 # views.py
-from rest_framework import viewsets
+from rest_framework import status, viewsets
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+
+class CatalogCacheMixin:
+    """
+    Serves list/retrieve responses from the catalog cache and answers
+    `If-None-Match` with 304 while the catalog version is unchanged. Responses
+    rendered with user-specific context (`extra_fields`) bypass the cache.
+    """
+
+    def cached_response(self, request, build_response):
+        if self.get_serializer_context().get("extra_fields"):
+            # per-user progress and entitlements are never shared across users
+            return build_response()
+
+        tag = catalog_cache.make_etag(
+            catalog_cache.get_version(),
+            f"{self.basename}:{request.get_full_path()}",
+        )
+        cache_key = catalog_cache.make_key(tag)
+        etag = f'"{tag}"'
 
-class AdminTopicsViewset(viewsets.ModelViewSet):
+        if request.META.get("HTTP_IF_NONE_MATCH") == etag:
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+        data = catalog_cache.get(cache_key)
+        if data is None:
+            response = build_response()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            catalog_cache.set(cache_key, data)
+
+        return Response(data, status=status.HTTP_200_OK, headers={"ETag": etag})
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(CatalogCacheMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(CatalogCacheMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+
+class AdminTopicsViewset(CatalogCacheMixin, viewsets.ModelViewSet):
     queryset = Topics.objects.all()
     serializer_class = TopicSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
 
 
-class AdminChaptersViewset(viewsets.ModelViewSet):
+class AdminChaptersViewset(CatalogCacheMixin, viewsets.ModelViewSet):
     queryset = Chapter.objects.all()
     serializer_class = ChapterSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
 
+    def get_queryset(self):
+        return chapter_tree_queryset(
+            super().get_queryset(), self.get_serializer_context()
+        )
+
 # urls.py
 from rest_framework import routers
 router = routers.SimpleRouter()
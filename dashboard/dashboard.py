@@ -20,6 +20,12 @@ class DashboardProgress(ActivatorModel, TimeStampedModel):
 
     class Meta:
         verbose_name = "DashboardProgress"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "week_start_date"],
+                name="unique_dashboard_progress_user_week",
+            )
+        ]
 
 # serializers.py
 from rest_framework import serializers
@@ -39,13 +45,15 @@ class StandardResultsSetPagination(PageNumberPagination):
 
 
 # func.py
+import json
 from datetime import datetime, timedelta
 
 import pytz
 from django.conf import settings
-from django.db.models import Sum
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
 
-from course.models import TopicProgress
+from course.models import TopicProgress, UserProgressAggregate
 
 WEEKDAYS = [
     "Monday",
@@ -67,6 +75,99 @@ DEFAULT_WEEKDAYS = {
     "Sunday": 0,
 }
 
+def current_week() -> tuple:
+    """
+    Function to get today's weekday index and the current week's bounds.
+
+    return:
+        tuple: (weekday index, week start date, week end date)
+    """
+    now = datetime.now(pytz.timezone(settings.TIME_ZONE))
+    today = now.weekday()
+    week_start = now - timedelta(days=today)
+    week_end = week_start + timedelta(days=6)
+    return today, week_start.date(), week_end.date()
+
+UPSERT_DAY_SQL = {
+    "postgresql": (
+        "INSERT INTO {table} (user_id, week_start_date, week_end_date, data, "
+        "status, activate_date, created, modified) "
+        "VALUES (%s, %s, %s, %s::jsonb, %s, %s, %s, %s) "
+        "ON CONFLICT (user_id, week_start_date) DO UPDATE SET "
+        "data = COALESCE({table}.data, '{{}}'::jsonb) "
+        "|| jsonb_build_object(%s::text, %s::integer), "
+        "modified = EXCLUDED.modified "
+        "RETURNING *"
+    ),
+    "sqlite": (
+        "INSERT INTO {table} (user_id, week_start_date, week_end_date, data, "
+        "status, activate_date, created, modified) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s) "
+        "ON CONFLICT (user_id, week_start_date) DO UPDATE SET "
+        "data = json_set(COALESCE({table}.data, '{{}}'), '$.' || %s, %s), "
+        "modified = excluded.modified "
+        "RETURNING *"
+    ),
+}
+
+def upsert_day_progress(
+    user: object, week_start, week_end, weekday: str, value: int
+) -> DashboardProgress:
+    """
+    Function to write one day's progress into the user's weekly row with a
+    single INSERT ... ON CONFLICT statement, so concurrent requests for the
+    same user and week never create duplicate rows.
+
+    params:
+        user: object: User object.
+        week_start: date: first day of the week.
+        week_end: date: last day of the week.
+        weekday: str: key of the day in `data`.
+        value: int: progress value for the day.
+
+    return:
+        instance: DashboardProgress object.
+    """
+    sql = UPSERT_DAY_SQL.get(connection.vendor)
+    if sql is None:
+        return _locked_day_progress(user, week_start, week_end, weekday, value)
+
+    now = timezone.now()
+    data = {**DEFAULT_WEEKDAYS, weekday: value}
+    params = [
+        user.id,
+        week_start,
+        week_end,
+        json.dumps(data),
+        DashboardProgress.ACTIVE_STATUS,
+        now,
+        now,
+        now,
+        weekday,
+        value,
+    ]
+    table = connection.ops.quote_name(DashboardProgress._meta.db_table)
+    return list(DashboardProgress.objects.raw(sql.format(table=table), params))[0]
+
+def _locked_day_progress(user, week_start, week_end, weekday, value):
+    queryset = DashboardProgress.objects.select_for_update()
+    defaults = {"week_end_date": week_end, "data": {**DEFAULT_WEEKDAYS, weekday: value}}
+    try:
+        with transaction.atomic():
+            instance, created = queryset.get_or_create(
+                user=user, week_start_date=week_start, defaults=defaults
+            )
+    except IntegrityError:
+        # lost the insert race, the row exists now
+        created = False
+
+    if not created:
+        with transaction.atomic():
+            instance = queryset.get(user=user, week_start_date=week_start)
+            instance.data = {**(instance.data or DEFAULT_WEEKDAYS), weekday: value}
+            instance.save(update_fields=["data", "modified"])
+    return instance
+
 def dashboard_progress(user: object, instance=None, total_topic_progress=0) -> None:
     """
     Function to count user's weekly progress based on answers submitted.
@@ -79,42 +180,282 @@ def dashboard_progress(user: object, instance=None, total_topic_progress=0) -> N
     return:
         None
     """
-    today = datetime.now(pytz.timezone(settings.TIME_ZONE)).weekday()
-    queryset = TopicProgress.objects.filter(
-        user=user,
-    )
-
-    total_progress = queryset.aggregate(Sum("progress")).get("progress__sum")
+    today, week_start, week_end = current_week()
+    total_topic_progress = UserProgressAggregate.objects.get_or_fill(user.id).average
 
-    week_start = datetime.now(pytz.timezone(settings.TIME_ZONE)) - timedelta(days=today)
-    week_end = week_start + timedelta(days=6)
+    instance = upsert_day_progress(
+        user, week_start, week_end, WEEKDAYS[today], total_topic_progress
+    )
+    invalidate_dashboard_cache([user.id])
+    return instance
 
-    if total_progress:
-        total_topic_progress = int(total_progress / queryset.count())
+def current_week_progress(user: object) -> DashboardProgress:
+    """
+    Function to read the user's current week progress without writing.
 
-    dash_queryset = DashboardProgress.objects.filter(
-        user=user, week_start_date=week_start.date(), week_end_date=week_end.date()
-    )
+    params:
+        user: object: User object.
 
-    if dash_queryset.exists():
-        instance = dash_queryset.first()
-        instance.data[f"{WEEKDAYS[today]}"] = total_topic_progress
-        instance.save()
-    else:
-        instance = DashboardProgress.objects.create(
-            week_start_date=week_start.date(),
-            week_end_date=week_end.date(),
+    return:
+        instance: DashboardProgress object, unsaved with default data when the
+        weekly snapshot has not been built for the user yet.
+    """
+    _, week_start, week_end = current_week()
+    instance = DashboardProgress.objects.filter(
+        user=user, week_start_date=week_start
+    ).first()
+    if instance is None:
+        instance = DashboardProgress(
             user=user,
-            data=DEFAULT_WEEKDAYS,
+            week_start_date=week_start,
+            week_end_date=week_end,
+            data=dict(DEFAULT_WEEKDAYS),
         )
     return instance
 
+# cache.py
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+DASHBOARD_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+DASHBOARD_CACHE_HITS_KEY = "dashboard:progress:hits"
+DASHBOARD_CACHE_MISSES_KEY = "dashboard:progress:misses"
+
+def dashboard_version_key(user_id: int) -> str:
+    return f"dashboard:progress:version:{user_id}"
+
+def dashboard_cache_key(user_id: int, week_start, version: int) -> str:
+    return f"dashboard:progress:{user_id}:{week_start.isoformat()}:{version}"
+
+def _count(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+def _dashboard_version(user_id: int) -> int:
+    key = dashboard_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # seeded from the clock so an evicted version never repeats
+        cache.add(key, time.time_ns() // 1000, timeout=DASHBOARD_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+def cached_dashboard_data(user: object) -> dict:
+    """
+    Function to get the serialized current week progress for a user from the
+    cache, building and storing it on a miss. The key carries the user's
+    dashboard version, read before the row, so a payload built while the
+    row is being invalidated is stored under a key nobody reads again.
+
+    params:
+        user: object: User object.
+
+    return:
+        dict: DashboardSerializer data.
+    """
+    _, week_start, _ = current_week()
+    key = dashboard_cache_key(user.id, week_start, _dashboard_version(user.id))
+    data = cache.get(key)
+    if data is not None:
+        _count(DASHBOARD_CACHE_HITS_KEY)
+        return data
+
+    _count(DASHBOARD_CACHE_MISSES_KEY)
+    data = dict(DashboardSerializer(current_week_progress(user)).data)
+    cache.set(key, data, timeout=DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+def invalidate_dashboard_cache(user_ids) -> None:
+    user_ids = list(user_ids)
+
+    def bump():
+        for user_id in user_ids:
+            try:
+                cache.incr(dashboard_version_key(user_id))
+            except ValueError:
+                _dashboard_version(user_id)
+
+    # after commit, so a reader can't rebuild from the old row under the new
+    # version
+    transaction.on_commit(bump)
+
+def dashboard_cache_stats() -> dict:
+    stats = cache.get_many([DASHBOARD_CACHE_HITS_KEY, DASHBOARD_CACHE_MISSES_KEY])
+    hits = stats.get(DASHBOARD_CACHE_HITS_KEY, 0)
+    misses = stats.get(DASHBOARD_CACHE_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
+
+# signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from course.models import topic_progress_flushed
+
+@receiver([post_save, post_delete], sender=TopicProgress)
+def invalidate_user_dashboard(sender, instance, **kwargs):
+    if instance.user_id:
+        invalidate_dashboard_cache([instance.user_id])
+
+@receiver(topic_progress_flushed)
+def invalidate_flushed_dashboards(sender, user_ids, **kwargs):
+    invalidate_dashboard_cache(user_ids)
+
+# management/commands/snapshot_dashboard_progress.py
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Sum
+
+
+class Command(BaseCommand):
+    help = "Write today's progress value into every user's weekly dashboard row."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        today, week_start, week_end = current_week()
+        weekday = WEEKDAYS[today]
+
+        totals = (
+            TopicProgress.objects.filter(user__isnull=False)
+            .values("user")
+            .annotate(progress_sum=Sum("progress"), topic_count=Count("id"))
+            .order_by("user")
+        )
+
+        written = 0
+        chunk = []
+        for row in totals.iterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                written += self.upsert_chunk(chunk, weekday, week_start, week_end)
+                chunk = []
+        if chunk:
+            written += self.upsert_chunk(chunk, weekday, week_start, week_end)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {weekday} progress for {written} users.")
+        )
+
+    def upsert_chunk(self, rows, weekday, week_start, week_end) -> int:
+        existing = dict(
+            DashboardProgress.objects.filter(
+                user__in=[row["user"] for row in rows], week_start_date=week_start
+            ).values_list("user", "data")
+        )
+        now = timezone.now()
+        instances = []
+        for row in rows:
+            value = int((row["progress_sum"] or 0) / row["topic_count"])
+            data = existing.get(row["user"]) or DEFAULT_WEEKDAYS
+            instances.append(
+                DashboardProgress(
+                    user_id=row["user"],
+                    week_start_date=week_start,
+                    week_end_date=week_end,
+                    data={**data, weekday: value},
+                    activate_date=now,
+                    created=now,
+                    modified=now,
+                )
+            )
+
+        DashboardProgress.objects.bulk_create(
+            instances,
+            update_conflicts=True,
+            unique_fields=["user", "week_start_date"],
+            update_fields=["week_end_date", "data", "modified"],
+        )
+        invalidate_dashboard_cache([row["user"] for row in rows])
+        return len(instances)
+
+# history.py
+import numpy as np
+
+MAX_HISTORY_WEEKS = 104
+
+def progress_history(user: object, weeks: int, window: int) -> dict:
+    """
+    Function to build the user's progress history for the last `weeks` weeks
+    from one query, with rollups computed on a NumPy matrix of daily values.
+
+    params:
+        user: object: User object.
+        weeks: int: number of weeks including the current one.
+        window: int: moving average window in weeks.
+
+    return:
+        dict: daily data per week, weekly and monthly averages and the weekly
+        moving average.
+    """
+    _, week_start, _ = current_week()
+    week_starts = [
+        week_start - timedelta(weeks=offset) for offset in reversed(range(weeks))
+    ]
+    rows = dict(
+        DashboardProgress.objects.filter(
+            user=user, week_start_date__gte=week_starts[0]
+        ).values_list("week_start_date", "data")
+    )
+
+    # weeks x days matrix, weeks without a row count as zero progress
+    daily = np.array(
+        [
+            [(rows.get(start) or {}).get(day, 0) for day in WEEKDAYS]
+            for start in week_starts
+        ],
+        dtype=float,
+    )
+    weekly = daily.mean(axis=1)
+
+    window = min(window, weeks)
+    moving = np.convolve(weekly, np.ones(window) / window, mode="valid")
+
+    months, month_index = np.unique(
+        [start.strftime("%Y-%m") for start in week_starts], return_inverse=True
+    )
+    monthly = np.bincount(month_index, weights=weekly) / np.bincount(month_index)
+
+    return {
+        "weeks": [
+            {
+                "week_start_date": start,
+                "week_end_date": start + timedelta(days=6),
+                "data": dict(zip(WEEKDAYS, values.astype(int).tolist())),
+            }
+            for start, values in zip(week_starts, daily)
+        ],
+        "weekly": [
+            {"week_start_date": start, "average": round(value, 2)}
+            for start, value in zip(week_starts, weekly.tolist())
+        ],
+        "monthly": [
+            {"month": month, "average": round(value, 2)}
+            for month, value in zip(months.tolist(), monthly.tolist())
+        ],
+        "moving_average": [
+            {"week_start_date": start, "average": round(value, 2)}
+            for start, value in zip(week_starts[window - 1 :], moving.tolist())
+        ],
+    }
+
 # views.py
 from django.conf import settings
 from rest_framework import status
 from rest_framework.generics import ListAPIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 class DashboardProgressView(ListAPIView):
     queryset = DashboardProgress.objects.all()
@@ -123,8 +464,53 @@ class DashboardProgressView(ListAPIView):
     pagination_class = StandardResultsSetPagination
 
     def list(self, request, *args, **kwargs):
-        # create graph data
-        instance = dashboard_progress(request.user)
+        # graph data is built by the snapshot_dashboard_progress command
+        data = cached_dashboard_data(request.user)
+        return Response({"data": data}, status=status.HTTP_200_OK)
+
+class DashboardConstantsMessage:
+    INVALID_HISTORY_RANGE = (
+        f"weeks must be between 1 and {MAX_HISTORY_WEEKS} and window at least 1."
+    )
+
+class DashboardProgressHistoryView(ListAPIView):
+    queryset = DashboardProgress.objects.all()
+    serializer_class = DashboardSerializer
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request, *args, **kwargs):
+        try:
+            weeks = int(request.query_params.get("weeks", 12))
+            window = int(request.query_params.get("window", 4))
+        except ValueError:
+            weeks = window = 0
+
+        if not 1 <= weeks <= MAX_HISTORY_WEEKS or window < 1:
+            return Response(
+                {"message": DashboardConstantsMessage.INVALID_HISTORY_RANGE},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        data = progress_history(request.user, weeks, window)
+        return Response({"data": data}, status=status.HTTP_200_OK)
+
+class DashboardCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"data": dashboard_cache_stats()}, status=status.HTTP_200_OK)
+
+# urls.py
+from django.urls import path
 
-        serializer = DashboardSerializer(instance)
-        return Response({"data": serializer.data}, status=status.HTTP_200_OK)
+path("progress/", DashboardProgressView.as_view(), name="dashboard-progress"),
+path(
+    "progress/history/",
+    DashboardProgressHistoryView.as_view(),
+    name="dashboard-progress-history",
+),
+path(
+    "progress/cache-stats/",
+    DashboardCacheStatsView.as_view(),
+    name="dashboard-progress-cache-stats",
+),
\ No newline at end of file
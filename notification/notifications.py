@@ -1,3 +1,101 @@
+# models.py
+from django.conf import settings
+from django.db import models
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+
+class NotificationCounterManager(models.Manager):
+    # only existing rows are shifted; notification_counts() and the reconcile
+    # command create them from a real count
+    def apply_delta(self, user_id: int, unread=0, read=0) -> None:
+        if not user_id or not (unread or read):
+            return
+        self.filter(user_id=user_id).update(
+            unread_count=F("unread_count") + unread, read_count=F("read_count") + read
+        )
+        publish_counter_change([user_id])
+
+    def apply_bulk_delta(self, user_ids, unread=0, read=0) -> None:
+        self.filter(user_id__in=user_ids).update(
+            unread_count=F("unread_count") + unread, read_count=F("read_count") + read
+        )
+        publish_counter_change(user_ids)
+
+class NotificationCounter(models.Model):
+    """
+    Per-user unread/read notification counts, kept current by Notification
+    signals and the bulk notification helpers. Rows are created on first read
+    by notification_counts() or by reconcile_notification_counters.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notification_counter",
+        verbose_name=_("User"),
+    )
+    unread_count = models.IntegerField(_("Unread Count"), default=0)
+    read_count = models.IntegerField(_("Read Count"), default=0)
+
+    objects = NotificationCounterManager()
+
+    class Meta:
+        verbose_name = _("Notification Counter")
+
+class NotificationStateChange(models.Model):
+    """
+    Log of notification read-state changes, so delta sync can return
+    notifications whose unread flag flipped after a client's watermark.
+    """
+
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notification_state_changes",
+        verbose_name=_("Recipient"),
+    )
+    notification_id = models.BigIntegerField(_("Notification ID"))
+    unread = models.BooleanField(_("Unread"))
+    changed = models.DateTimeField(_("Changed"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Notification State Change")
+        indexes = [
+            models.Index(
+                fields=["recipient", "id"], name="notification_change_sync_idx"
+            ),
+        ]
+
+class NotificationSyncStateManager(models.Manager):
+    def bump_prune_seq(self, user_ids) -> None:
+        # a zero row is a correct start here: nothing was pruned before
+        user_ids = list(user_ids)
+        self.bulk_create(
+            [self.model(user_id=user_id) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
+        self.filter(user_id__in=user_ids).update(prune_seq=F("prune_seq") + 1)
+
+class NotificationSyncState(models.Model):
+    """
+    Per-user count of retention runs that removed the user's notifications or
+    read-state changes. It is part of the sync watermark, so clients synced
+    before a prune are told to reload instead of keeping deleted rows.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notification_sync_state",
+        verbose_name=_("User"),
+    )
+    prune_seq = models.IntegerField(_("Prune Sequence"), default=0)
+
+    objects = NotificationSyncStateManager()
+
+    class Meta:
+        verbose_name = _("Notification Sync State")
+
 # serializers.py
 from rest_framework import serializers
 
@@ -11,27 +109,644 @@ class NotificationSerializer(serializers.Serializer):
     verb = serializers.CharField()
     timestamp = serializers.DateTimeField()
 
+# pubsub.py
+import abc
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+class NotificationBroker(abc.ABC):
+    """
+    Interface for delivering notification events to connected clients.
+    Set NOTIFICATION_BROKER to the dotted path of a subclass to fan events
+    out across processes; the default only reaches this process.
+    """
+
+    @abc.abstractmethod
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        pass
+
+    @abc.abstractmethod
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        pass
+
+    @abc.abstractmethod
+    def publish(self, user_id: int, event: dict) -> None:
+        pass
+
+class InMemoryBroker(NotificationBroker):
+    def __init__(self):
+        self._subscribers = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers[user_id][queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers[user_id].pop(queue, None)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id: int, event: dict) -> None:
+        # publishers run in sync worker threads, so hand off to each event loop
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, {}).items())
+        for queue, loop in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+_broker = None
+
+def get_broker() -> NotificationBroker:
+    global _broker
+    if _broker is None:
+        broker_path = getattr(settings, "NOTIFICATION_BROKER", None)
+        _broker = import_string(broker_path)() if broker_path else InMemoryBroker()
+    return _broker
+
+def publish_counter_change(user_ids) -> None:
+    user_ids = list(user_ids)
+
+    def publish():
+        broker = get_broker()
+        for user_id in user_ids:
+            broker.publish(user_id, {"type": "unread_count"})
+
+    transaction.on_commit(publish)
+
+def notification_event(notification) -> dict:
+    return {
+        "type": "notification",
+        "id": notification.id,
+        "unread": notification.unread,
+        "verb": notification.verb,
+        "timestamp": notification.timestamp.isoformat(),
+    }
+
+def publish_notification(notification) -> None:
+    publish_notifications([notification])
+
+def publish_notifications(notifications) -> None:
+    events = [
+        (notification.recipient_id, notification_event(notification))
+        for notification in notifications
+    ]
+
+    def publish():
+        broker = get_broker()
+        for user_id, event in events:
+            broker.publish(user_id, event)
+
+    transaction.on_commit(publish)
+
+# signals.py
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from notifications.models import Notification
+
+def counter_delta(unread: bool, sign=1) -> dict:
+    return {"unread": sign} if unread else {"read": sign}
+
+@receiver(post_init, sender=Notification)
+def remember_notification_state(sender, instance, **kwargs):
+    if "unread" not in instance.get_deferred_fields():
+        instance._saved_unread = instance.unread
+
+@receiver(post_save, sender=Notification)
+def update_notification_counter(sender, instance, created, **kwargs):
+    saved_unread = getattr(instance, "_saved_unread", None)
+    if created:
+        NotificationCounter.objects.apply_delta(
+            instance.recipient_id, **counter_delta(instance.unread)
+        )
+        publish_notification(instance)
+    elif saved_unread is not None and saved_unread != instance.unread:
+        NotificationCounter.objects.apply_delta(
+            instance.recipient_id,
+            **counter_delta(saved_unread, -1),
+            **counter_delta(instance.unread),
+        )
+        NotificationStateChange.objects.create(
+            recipient_id=instance.recipient_id,
+            notification_id=instance.id,
+            unread=instance.unread,
+        )
+    instance._saved_unread = instance.unread
+
+@receiver(post_delete, sender=Notification)
+def remove_from_notification_counter(sender, instance, **kwargs):
+    NotificationCounter.objects.apply_delta(
+        instance.recipient_id, **counter_delta(instance.unread, -1)
+    )
+
+# management/commands/reconcile_notification_counters.py
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's unread/read notification counters."
+
+    def handle(self, *args, **options):
+        totals = defaultdict(lambda: [0, 0])
+        for row in (
+            Notification.objects.values("recipient", "unread")
+            .annotate(total=Count("id"))
+            .order_by()
+        ):
+            totals[row["recipient"]][0 if row["unread"] else 1] = row["total"]
+
+        drifted = []
+        for counter in NotificationCounter.objects.all().iterator():
+            expected = totals.pop(counter.user_id, [0, 0])
+            if [counter.unread_count, counter.read_count] != expected:
+                counter.unread_count, counter.read_count = expected
+                drifted.append(counter)
+
+        NotificationCounter.objects.bulk_update(
+            drifted, ["unread_count", "read_count"], batch_size=1000
+        )
+        missing = NotificationCounter.objects.bulk_create(
+            [
+                NotificationCounter(user_id=user, unread_count=unread, read_count=read)
+                for user, (unread, read) in totals.items()
+            ],
+            batch_size=1000,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {len(drifted)} drifted and {len(missing)} missing "
+                "notification counters."
+            )
+        )
+
+# migrations/0002_notification_indexes.py
+from django.db import migrations
+
+# Notification is a third-party model, so the indexes behind counter
+# reconciliation, delta sync and the paginated list are created with SQL;
+# CONCURRENTLY keeps the table writable while they build on PostgreSQL
+NOTIFICATION_INDEXES = {
+    "notification_recipient_unread_idx": "(recipient_id, unread) WHERE unread",
+    "notification_recipient_timestamp_idx": "(recipient_id, timestamp)",
+    "notification_recipient_id_idx": "(recipient_id, id)",
+}
+
+
+def create_notification_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    table = connection.ops.quote_name(
+        apps.get_model("notifications", "Notification")._meta.db_table
+    )
+    concurrently = "CONCURRENTLY " if connection.vendor == "postgresql" else ""
+    for name, definition in NOTIFICATION_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {table} {definition}"
+        )
+
+
+def drop_notification_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    concurrently = "CONCURRENTLY " if connection.vendor == "postgresql" else ""
+    for name in NOTIFICATION_INDEXES:
+        schema_editor.execute(f"DROP INDEX {concurrently}IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_notification_indexes, drop_notification_indexes
+        ),
+    ]
+
+# retention.py
+import time
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+
+DEFAULT_NOTIFICATION_RETENTION = {
+    "read_days": 90,
+    "collapse_verbs": True,
+    "change_log_days": 30,
+    "chunk_size": 5000,
+}
+
+def notification_retention_policy(**overrides) -> dict:
+    policy = {
+        **DEFAULT_NOTIFICATION_RETENTION,
+        **getattr(settings, "NOTIFICATION_RETENTION", {}),
+    }
+    policy.update({key: value for key, value in overrides.items() if value is not None})
+    return policy
+
+def delete_notifications(ids) -> int:
+    """
+    A function to delete notifications by id in one statement, adjusting the
+    recipients' counters from a grouped count instead of per-row signals and
+    flagging the recipients for a full sync.
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+
+    totals = (
+        Notification.objects.filter(id__in=ids)
+        .values("recipient", "unread")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    recipients = set()
+    for row in totals:
+        recipients.add(row["recipient"])
+        NotificationCounter.objects.apply_delta(
+            row["recipient"], **counter_delta(row["unread"], -row["total"])
+        )
+    NotificationSyncState.objects.bump_prune_seq(recipients)
+
+    # counters are handled above, so the per-row post_delete signal is skipped
+    table = connection.ops.quote_name(Notification._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", ids)
+        return cursor.rowcount
+
+def _delete_in_chunks(queryset, chunk_size: int) -> int:
+    # re-select after every chunk instead of holding a cursor over deleted rows
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by("id").values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            deleted += delete_notifications(ids)
+
+def _collapse_duplicates(chunk_size: int) -> int:
+    # group one batch of recipients at a time rather than the whole table
+    recipients = (
+        Notification.objects.order_by("recipient")
+        .values_list("recipient", flat=True)
+        .distinct()
+    )
+    collapsed = 0
+    last_recipient = 0
+    while True:
+        batch = list(recipients.filter(recipient__gt=last_recipient)[:chunk_size])
+        if not batch:
+            return collapsed
+
+        groups = (
+            Notification.objects.filter(recipient__in=batch)
+            .values("recipient", "verb", "actor_content_type", "actor_object_id")
+            .annotate(keep_id=Max("id"), total=Count("id"))
+            .filter(total__gt=1)
+            .order_by()
+        )
+        for group in groups:
+            collapsed += _delete_in_chunks(
+                Notification.objects.filter(
+                    recipient=group["recipient"],
+                    verb=group["verb"],
+                    actor_content_type=group["actor_content_type"],
+                    actor_object_id=group["actor_object_id"],
+                    id__lt=group["keep_id"],
+                ),
+                chunk_size,
+            )
+        last_recipient = batch[-1]
+
+def _delete_state_changes(queryset, chunk_size: int) -> int:
+    deleted = 0
+    while True:
+        rows = list(
+            queryset.order_by("id").values_list("id", "recipient")[:chunk_size]
+        )
+        if not rows:
+            return deleted
+        with transaction.atomic():
+            NotificationSyncState.objects.bump_prune_seq(
+                {recipient for _, recipient in rows}
+            )
+            count, _ = NotificationStateChange.objects.filter(
+                id__in=[pk for pk, _ in rows]
+            ).delete()
+        deleted += count
+
+def apply_notification_retention(**overrides) -> dict:
+    """
+    A function to prune notifications according to the retention policy:
+    read notifications older than `read_days` are deleted, repeated identical
+    notifications are collapsed into the newest one, and read-state change
+    log rows older than `change_log_days` are dropped. Affected users get a
+    new prune sequence, so their next delta sync asks for a full reload.
+
+    return:
+        dict: rows removed per policy, elapsed seconds and rows per second
+    """
+    policy = notification_retention_policy(**overrides)
+    chunk_size = policy["chunk_size"]
+    started = time.monotonic()
+    now = timezone.now()
+
+    expired = Notification.objects.filter(
+        unread=False, timestamp__lt=now - timedelta(days=policy["read_days"])
+    )
+    report = {"expired": _delete_in_chunks(expired, chunk_size), "collapsed": 0}
+
+    if policy["collapse_verbs"]:
+        report["collapsed"] = _collapse_duplicates(chunk_size)
+
+    report["change_log"] = _delete_state_changes(
+        NotificationStateChange.objects.filter(
+            changed__lt=now - timedelta(days=policy["change_log_days"])
+        ),
+        chunk_size,
+    )
+
+    elapsed = time.monotonic() - started
+    removed = report["expired"] + report["collapsed"] + report["change_log"]
+    report["seconds"] = round(elapsed, 2)
+    report["rows_per_second"] = round(removed / elapsed) if elapsed else removed
+    return report
+
+# management/commands/prune_notifications.py
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Delete old read notifications and collapse repeated ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--read-days", type=int)
+        parser.add_argument("--change-log-days", type=int)
+        parser.add_argument("--chunk-size", type=int)
+        parser.add_argument("--no-collapse", action="store_true")
+
+    def handle(self, *args, **options):
+        report = apply_notification_retention(
+            read_days=options["read_days"],
+            change_log_days=options["change_log_days"],
+            chunk_size=options["chunk_size"],
+            collapse_verbs=False if options["no_collapse"] else None,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Removed {expired} expired and {collapsed} collapsed notifications "
+                "and {change_log} state changes in {seconds}s "
+                "({rows_per_second} rows/s).".format(**report)
+            )
+        )
+
+# pagination.py
+from rest_framework.pagination import PageNumberPagination
+
+class StandardResultsSetPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
 # funcs.py
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, Max
+
+NOTIFICATION_SYNC_LIMIT = 500
+
+NOTIFICATION_FIELDS = [
+    "id",
+    "unread",
+    "emailed",
+    "deleted",
+    "actor_content_type_id",
+    "actor_object_id",
+    "verb",
+    "timestamp",
+]
+
+def notification_actors(rows) -> dict:
+    """
+    A function to resolve notification actors with one query per actor
+    content type, using the ContentType cache for the types themselves.
+    """
+    object_ids = defaultdict(set)
+    for row in rows:
+        object_ids[row["actor_content_type_id"]].add(row["actor_object_id"])
+
+    actors = {}
+    for content_type_id, ids in object_ids.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            continue
+        for actor in model._base_manager.filter(pk__in=ids):
+            actors[(content_type_id, str(actor.pk))] = str(actor)
+    return actors
+
+def notification_counts(user: object) -> tuple:
+    """
+    A function to read the user's (unread, read) notification counts from the
+    maintained counter row, counting once when the row does not exist yet.
+    """
+    counter = (
+        NotificationCounter.objects.filter(user=user)
+        .values_list("unread_count", "read_count")
+        .first()
+    )
+    if counter is not None:
+        return counter
+
+    counts = dict(
+        Notification.objects.filter(recipient=user)
+        .values_list("unread")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    counter, _ = NotificationCounter.objects.get_or_create(
+        user=user,
+        defaults={
+            "unread_count": counts.get(True, 0),
+            "read_count": counts.get(False, 0),
+        },
+    )
+    return counter.unread_count, counter.read_count
+
+def mark_notifications_read(user: object, ids=None, up_to=None) -> int:
+    """
+    A function to mark the user's unread notifications as read with a single
+    UPDATE, by id list and/or everything up to a timestamp.
+
+    params:
+        user: object: recipient user object
+        ids: list: notification ids
+        up_to: datetime: mark notifications sent at or before this time
+
+    return:
+        int: number of notifications marked as read
+    """
+    queryset = Notification.objects.filter(recipient=user, unread=True)
+    if ids is not None:
+        queryset = queryset.filter(id__in=ids)
+    if up_to is not None:
+        queryset = queryset.filter(timestamp__lte=up_to)
+
+    with transaction.atomic():
+        ids = list(queryset.select_for_update().values_list("id", flat=True))
+        marked = Notification.objects.filter(id__in=ids).update(unread=False)
+        # update() skips signals, so the counter and change log are written here
+        NotificationCounter.objects.apply_delta(user.id, unread=-marked, read=marked)
+        NotificationStateChange.objects.bulk_create(
+            [
+                NotificationStateChange(
+                    recipient_id=user.id, notification_id=pk, unread=False
+                )
+                for pk in ids
+            ],
+            batch_size=1000,
+        )
+    return marked
+
+def parse_sync_watermark(watermark: str) -> tuple:
+    """
+    A function to split a "<notification id>.<state change id>.<prune seq>"
+    watermark, raising ValueError for malformed input. Watermarks issued
+    before the prune sequence existed count as sequence 0.
+    """
+    parts = [int(part) for part in watermark.split(".")]
+    if len(parts) == 2:
+        parts.append(0)
+    last_id, last_change_id, prune_seq = parts
+    return last_id, last_change_id, prune_seq
+
+def notification_sync(user: object, last_id=0, last_change_id=0, prune_seq=0) -> dict:
+    """
+    A function to collect what changed for the user after a sync watermark.
+
+    params:
+        user: object: recipient user object
+        last_id: int: newest notification id the client has
+        last_change_id: int: newest read-state change id the client has
+        prune_seq: int: user's prune sequence when the watermark was issued
+
+    return:
+        dict: new notifications, read-state changes and the next watermark,
+        or `full_resync` with a fresh watermark when retention removed rows
+        since the watermark was issued
+    """
+    current_seq = (
+        NotificationSyncState.objects.filter(user=user)
+        .values_list("prune_seq", flat=True)
+        .first()
+    ) or 0
+    # a client starting from nothing has nothing stale to reload
+    if prune_seq != current_seq and (last_id or last_change_id):
+        head = Notification.objects.filter(recipient=user).aggregate(
+            last_id=Max("id")
+        )
+        head.update(
+            NotificationStateChange.objects.filter(recipient=user).aggregate(
+                last_change_id=Max("id")
+            )
+        )
+        return {
+            "full_resync": True,
+            "notifications": [],
+            "read_state": [],
+            "watermark": "{}.{}.{}".format(
+                head["last_id"] or 0, head["last_change_id"] or 0, current_seq
+            ),
+            "has_more": False,
+        }
+
+    new_rows = list(
+        Notification.objects.filter(recipient=user, id__gt=last_id)
+        .order_by("id")
+        .values(*NOTIFICATION_FIELDS)[:NOTIFICATION_SYNC_LIMIT]
+    )
+    changes = list(
+        NotificationStateChange.objects.filter(
+            recipient=user, id__gt=last_change_id
+        )
+        .order_by("id")
+        .values("id", "notification_id", "unread")[:NOTIFICATION_SYNC_LIMIT]
+    )
+
+    if new_rows:
+        last_id = new_rows[-1]["id"]
+    if changes:
+        last_change_id = changes[-1]["id"]
+
+    return {
+        "full_resync": False,
+        "notifications": notification_data(new_rows),
+        "read_state": [
+            {"id": change["notification_id"], "unread": change["unread"]}
+            for change in changes
+        ],
+        "watermark": f"{last_id}.{last_change_id}.{current_seq}",
+        "has_more": NOTIFICATION_SYNC_LIMIT in (len(new_rows), len(changes)),
+    }
+
+def notification_sync_since(user: object, since: str):
+    """
+    A function to build the sync delta after a sync watermark, raising
+    ValueError for a malformed watermark.
+
+    return:
+        dict: serialized delta, or None when nothing changed since `since`
+    """
+    data = notification_sync(user, *parse_sync_watermark(since))
+    if data["watermark"] == since:
+        return None
+    data["notifications"] = NotificationSerializer(
+        data["notifications"], many=True
+    ).data
+    return data
+
 def notification_data(notifications) -> list:
     """
-    A function to prepare a list based on notifications queryset
+    A function to prepare a list based on notification `values()` rows
     """
+    rows = list(notifications)
+    actors = notification_actors(rows)
     data = [
         {
-            "id": notification.id,
-            "unread": notification.unread,
-            "emailed": notification.emailed,
-            "deleted": notification.deleted,
-            "actor": str(notification.actor),
-            "type": notification.actor_content_type.model,
-            "verb": notification.verb,
-            "timestamp": notification.timestamp,
+            "id": row["id"],
+            "unread": row["unread"],
+            "emailed": row["emailed"],
+            "deleted": row["deleted"],
+            "actor": actors.get(
+                (row["actor_content_type_id"], str(row["actor_object_id"])), "None"
+            ),
+            "type": ContentType.objects.get_for_id(row["actor_content_type_id"]).model,
+            "verb": row["verb"],
+            "timestamp": row["timestamp"],
         }
-        for notification in notifications
+        for row in rows
     ]
     return data
 
 # views.py
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from notifications.models import Notification
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -40,7 +755,14 @@ from rest_framework.views import APIView
 
 class NotificationConstantsMessage:
     TRANSACTION_DETAIL_FETCH = "Transaction details fetched successfully!"
-    
+    NOTIFICATION_NOT_FOUND = "Notification not found!"
+    NOTIFICATION_MARK_AS_READ = "Notification marked as read successfully!"
+    NOTIFICATIONS_MARK_AS_READ = "Notifications marked as read successfully!"
+    INVALID_SYNC_WATERMARK = "The since watermark is invalid."
+    IDS_OR_TIMESTAMP_REQUIRED = (
+        "Provide a list of notification ids or an ISO 8601 up_to timestamp."
+    )
+
 class GeneralConstantsMessage:
     UNREAD_FIELD_REQUIRED = "The unread field is required."
 
@@ -48,15 +770,22 @@ class NotificationList(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        notifications = Notification.objects.filter(
-            recipient=self.request.user
-        ).order_by("-timestamp")
-        data = notification_data(notifications)
+        notifications = (
+            Notification.objects.filter(recipient=self.request.user)
+            .order_by("-timestamp", "-id")
+            .values(*NOTIFICATION_FIELDS)
+        )
+        paginator = StandardResultsSetPagination()
+        page = paginator.paginate_queryset(notifications, request, view=self)
+        data = notification_data(page)
         serializer = NotificationSerializer(data, many=True)
 
         return Response(
             {
                 "data": serializer.data,
+                "count": paginator.page.paginator.count,
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
                 "message": NotificationConstantsMessage.TRANSACTION_DETAIL_FETCH,
             },
             status=status.HTTP_200_OK,
@@ -72,10 +801,30 @@ class NotificationTypeList(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        unread_count = Notification.objects.filter(
-            recipient=self.request.user, unread=request.data.get("unread")
-        ).count()
-        return Response({"unread_count": unread_count}, status=status.HTTP_200_OK)
+        unread = str(request.data.get("unread")).lower() in ("true", "1", "t")
+        unread_count, read_count = notification_counts(self.request.user)
+        return Response(
+            {"unread_count": unread_count if unread else read_count},
+            status=status.HTTP_200_OK,
+        )
+
+
+class NotificationSync(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        since = request.query_params.get("since", "0.0.0")
+        try:
+            data = notification_sync_since(request.user, since)
+        except ValueError:
+            return Response(
+                {"message": NotificationConstantsMessage.INVALID_SYNC_WATERMARK},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if data is None:
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return Response({"data": data}, status=status.HTTP_200_OK)
 
 
 class MarkNotificationAsRead(APIView):
@@ -101,13 +850,201 @@ class MarkNotificationAsRead(APIView):
         )
 
 
+class MarkNotificationsAsRead(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ids = request.data.get("ids")
+        try:
+            up_to = parse_datetime(str(request.data.get("up_to", "")))
+        except ValueError:
+            up_to = None
+        if up_to is not None and timezone.is_naive(up_to):
+            # timestamps without an offset are read in the current time zone
+            up_to = timezone.make_aware(up_to)
+        invalid_ids = ids is not None and not (
+            isinstance(ids, list) and all(str(pk).isdigit() for pk in ids)
+        )
+
+        # a bad ids list must not widen the request to everything up to up_to
+        if invalid_ids or (ids is None and up_to is None):
+            return Response(
+                {"message": NotificationConstantsMessage.IDS_OR_TIMESTAMP_REQUIRED},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        marked = mark_notifications_read(request.user, ids=ids, up_to=up_to)
+        unread_count, _ = notification_counts(request.user)
+        return Response(
+            {
+                "message": NotificationConstantsMessage.NOTIFICATIONS_MARK_AS_READ,
+                "marked": marked,
+                "unread_count": unread_count,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+# stream.py
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+NOTIFICATION_STREAM_KEEPALIVE = 25
+NOTIFICATION_POLL_TIMEOUT = 25
+
+def _authenticated_user(request):
+    authenticators = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    drf_request = Request(
+        request, authenticators=[authenticator() for authenticator in authenticators]
+    )
+    user = drf_request.user
+    return user if user.is_authenticated else None
+
+def _stream_watermark(request):
+    # EventSource resends the last event id on reconnect
+    return request.headers.get("Last-Event-ID") or request.GET.get("since")
+
+async def _stream_event(event: dict, user) -> dict:
+    if event["type"] == "unread_count":
+        unread_count, _ = await sync_to_async(notification_counts)(user)
+        return {"type": "unread_count", "unread_count": unread_count}
+    return event
+
+async def _sync_event(user, since: str):
+    data = await sync_to_async(notification_sync_since)(user, since)
+    if data is None:
+        return None
+    return {"type": "sync", **data}
+
+def _sse(event: dict) -> str:
+    message = "data: {}\n\n".format(json.dumps(event, cls=DjangoJSONEncoder))
+    if event["type"] == "sync":
+        message = "id: {}\n{}".format(event["watermark"], message)
+    return message
+
+async def notification_stream(request):
+    """
+    Server-Sent Events stream of the user's new notifications and unread
+    count changes. Idle connections only cost a parked coroutine and a
+    keepalive comment every NOTIFICATION_STREAM_KEEPALIVE seconds.
+
+    With a sync watermark (`?since=` or `Last-Event-ID`) the stream first
+    sends everything after it, then follows every event with a `sync` delta
+    whose event id is the next watermark, so reconnecting clients miss
+    nothing.
+    """
+    user = await sync_to_async(_authenticated_user)(request)
+    if user is None:
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+
+    since = _stream_watermark(request)
+    if since is not None:
+        try:
+            parse_sync_watermark(since)
+        except ValueError:
+            return HttpResponse(status=status.HTTP_400_BAD_REQUEST)
+
+    async def sync_events():
+        nonlocal since
+        while True:
+            event = await _sync_event(user, since)
+            if event is None:
+                return
+            since = event["watermark"]
+            yield _sse(event)
+            if not event["has_more"]:
+                return
+
+    async def events():
+        broker = get_broker()
+        # subscribe before catching up so nothing lands between the two
+        queue = broker.subscribe(user.id)
+        try:
+            yield "retry: 5000\n\n"
+            yield _sse(await _stream_event({"type": "unread_count"}, user))
+            if since is not None:
+                async for message in sync_events():
+                    yield message
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=NOTIFICATION_STREAM_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if since is not None:
+                    # new notifications and read-state flips both move the delta
+                    async for message in sync_events():
+                        yield message
+                if since is None or event["type"] != "notification":
+                    yield _sse(await _stream_event(event, user))
+        finally:
+            broker.unsubscribe(user.id, queue)
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+async def notification_long_poll(request):
+    """
+    Long-poll fallback: waits up to NOTIFICATION_POLL_TIMEOUT seconds for the
+    next event and answers 204 when nothing happened. With `?since=` it
+    answers straight away with the sync delta when anything is newer than
+    the watermark, and returns deltas instead of raw events.
+    """
+    user = await sync_to_async(_authenticated_user)(request)
+    if user is None:
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+
+    since = _stream_watermark(request)
+    broker = get_broker()
+    queue = broker.subscribe(user.id)
+    try:
+        if since is not None:
+            try:
+                event = await _sync_event(user, since)
+            except ValueError:
+                return HttpResponse(status=status.HTTP_400_BAD_REQUEST)
+            if event is not None:
+                return JsonResponse(event)
+
+        try:
+            event = await asyncio.wait_for(
+                queue.get(), timeout=NOTIFICATION_POLL_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+    finally:
+        broker.unsubscribe(user.id, queue)
+
+    if since is not None:
+        sync_event = await _sync_event(user, since)
+        if sync_event is not None:
+            return JsonResponse(sync_event)
+    return JsonResponse(await _stream_event(event, user))
+
 # urls.py
 from django.urls import path
 
 path("list/", NotificationList.as_view(), name="list-notification"),
 path("type/", NotificationTypeList.as_view(), name="notification-type"),
+path("sync/", NotificationSync.as_view(), name="notification-sync"),
 path(
     "mark-as-read/<int:pk>/",
     MarkNotificationAsRead.as_view(),
     name="mark-as-read-notification",
-),
\ No newline at end of file
+),
+path(
+    "mark-as-read/",
+    MarkNotificationsAsRead.as_view(),
+    name="mark-as-read-notifications",
+),
+path("stream/", notification_stream, name="notification-stream"),
+path("poll/", notification_long_poll, name="notification-long-poll"),
\ No newline at end of file
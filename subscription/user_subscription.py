@@ -125,12 +125,16 @@ class UserSubscription(ActivatorModel, TimeStampedModel):
 
 # utils.py
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from notifications.models import Notification
 
 from dashboard.dashboard import DashboardProgress
 from course.models import TopicProgress, Result
+from notification.notifications import NotificationCounter, publish_notifications
+from user.verify_email import get_user_by_email
 
 lifetime_duration = 0
+NOTIFICATION_CHUNK_SIZE = 5000
 
 def create_product_and_price(data, instance=None, product=None):
     """
@@ -201,7 +205,7 @@ def create_subscription_notification(
     return:
 
     """
-    content_type = ContentType.objects.get(app_label=model, model=model)
+    content_type = ContentType.objects.get_by_natural_key(model, model)
     Notification.objects.create(
         level=Notification.LEVELS.success,
         recipient=recipient,
@@ -211,6 +215,46 @@ def create_subscription_notification(
     )
     return SubscriptionConstantsMessage.NOTIFICATION_SUCCESS
 
+def create_subscription_notifications(
+    recipients, model: str, custom_notification: str, chunk_size=NOTIFICATION_CHUNK_SIZE
+) -> int:
+    """
+    A function to fan out one subscription notification to many recipients.
+
+    params:
+        recipients: iterable: user objects or user ids
+        model: str: model name
+        custom_notification: str: message to display
+        chunk_size: int: notifications inserted per statement
+
+    return:
+        int: number of notifications created
+    """
+    content_type = ContentType.objects.get_by_natural_key(model, model)
+    user_ids = list(
+        dict.fromkeys(getattr(recipient, "id", recipient) for recipient in recipients)
+    )
+
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start : start + chunk_size]
+        with transaction.atomic():
+            notifications = Notification.objects.bulk_create(
+                [
+                    Notification(
+                        level=Notification.LEVELS.success,
+                        recipient_id=user_id,
+                        actor_content_type=content_type,
+                        actor_object_id=content_type.id,
+                        verb=custom_notification,
+                    )
+                    for user_id in chunk
+                ]
+            )
+            # bulk_create skips signals, so counters and stream events are sent here
+            NotificationCounter.objects.apply_bulk_delta(chunk, unread=1)
+            publish_notifications(notifications)
+    return len(user_ids)
+
 
 def create_transaction_data(user: object, subscription: object, session: dict) -> bool:
     """
@@ -312,7 +356,7 @@ def webhook_event_data(event: dict, data: dict):
     if event_type == "checkout.session.completed":
         session = event["data"]["object"]
         email = data["data"]["object"]["metadata"]["user_email"]
-        user = User.objects.get(email=email)
+        user = get_user_by_email(email)
         price = data["data"]["object"]["amount_total"]
         checkout_session_line_item = stripe.checkout.Session.list_line_items(
             session["id"], limit=1
@@ -1,3 +1,39 @@
+# models.py
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
+
+class OutboxEmail(TimeStampedModel):
+    class DeliveryStatus(models.TextChoices):
+        Pending = "pending", _("Pending")
+        Sent = "sent", _("Sent")
+        Failed = "failed", _("Failed")
+
+    subject = models.TextField(_("Subject"), blank=True, default="")
+    body = models.TextField(_("Body"), blank=True, default="")
+    from_email = models.CharField(
+        _("From Email"), max_length=255, blank=True, null=True
+    )
+    recipient_list = models.JSONField(_("Recipients"), default=list)
+    status = models.CharField(
+        choices=DeliveryStatus.choices,
+        default=DeliveryStatus.Pending,
+        max_length=15,
+    )
+    attempts = models.IntegerField(_("Attempts"), default=0)
+    next_attempt_at = models.DateTimeField(_("Next Attempt At"), default=timezone.now)
+    last_error = models.TextField(_("Last Error"), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _("Outbox Email")
+        verbose_name_plural = _("Outbox Emails")
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="outbox_email_due_idx"
+            ),
+        ]
+
 # serializers.py
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
@@ -22,15 +58,149 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 1000
 
 # utils.py
-from django.core.mail import send_mail
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_BACKOFF_SECONDS = 30
+OUTBOX_MAX_BACKOFF_SECONDS = 60 * 60
+OUTBOX_LEASE_SECONDS = 5 * 60
+
 class UserConstantsMessage:
     DEFAULT_MAIL_SUCCESS = "Mail sent successfully!"
     ADMIN_CREDENTIALS_NOT_FOUND = "Admin credentials not found!"
    
 def send_admin_mail(subject, description, from_email, recipient_list):
-    send_mail(subject, description, from_email, recipient_list)
+    """
+    A function to queue an admin mail in the outbox; the drain_email_outbox
+    worker delivers it.
+    """
+    OutboxEmail.objects.create(
+        subject=subject or "",
+        body=description,
+        from_email=from_email,
+        recipient_list=list(recipient_list),
+    )
     return UserConstantsMessage.DEFAULT_MAIL_SUCCESS
 
+def outbox_backoff(attempts: int) -> timedelta:
+    seconds = OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, OUTBOX_MAX_BACKOFF_SECONDS))
+
+def record_outbox_failure(email: object, error: Exception, report: dict) -> None:
+    email.last_error = str(error)
+    if email.attempts >= OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboxEmail.DeliveryStatus.Failed
+        report["failed"] += 1
+    else:
+        email.next_attempt_at = timezone.now() + outbox_backoff(email.attempts)
+        report["retried"] += 1
+
+def drain_email_outbox(batch_size=OUTBOX_BATCH_SIZE) -> dict:
+    """
+    A function to deliver one batch of due outbox emails over a single mail
+    connection, rescheduling failures with exponential backoff.
+
+    params:
+        batch_size: int: emails claimed per batch
+
+    return:
+        dict: number of sent, retried and failed emails
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=OutboxEmail.DeliveryStatus.Pending, next_attempt_at__lte=now
+            )
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        # lease the batch so a crashed worker's emails are picked up again
+        OutboxEmail.objects.filter(id__in=[email.id for email in batch]).update(
+            next_attempt_at=now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+        )
+
+    report = {"sent": 0, "retried": 0, "failed": 0}
+    if not batch:
+        return report
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # nothing could be sent, so the whole batch counts as a failed attempt
+        for email in batch:
+            email.attempts += 1
+            record_outbox_failure(email, e, report)
+    else:
+        try:
+            for email in batch:
+                message = EmailMessage(
+                    email.subject,
+                    email.body,
+                    email.from_email,
+                    email.recipient_list,
+                    connection=connection,
+                )
+                email.attempts += 1
+                try:
+                    message.send()
+                except Exception as e:
+                    record_outbox_failure(email, e, report)
+                else:
+                    email.status = OutboxEmail.DeliveryStatus.Sent
+                    email.last_error = None
+                    report["sent"] += 1
+        finally:
+            connection.close()
+
+    OutboxEmail.objects.bulk_update(
+        batch, ["status", "attempts", "next_attempt_at", "last_error"]
+    )
+    return report
+
+# management/commands/drain_email_outbox.py
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=OUTBOX_BATCH_SIZE)
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep draining until interrupted."
+        )
+        parser.add_argument("--idle-sleep", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                report = drain_email_outbox(options["batch_size"])
+            except Exception as e:
+                if not options["loop"]:
+                    raise
+                # leased emails are retried once the lease runs out
+                self.stderr.write(f"Draining the outbox failed: {e}")
+                time.sleep(options["idle_sleep"])
+                continue
+
+            if any(report.values()):
+                self.stdout.write(
+                    "Sent {sent}, retried {retried}, failed {failed}.".format(**report)
+                )
+            if not options["loop"]:
+                return
+            if sum(report.values()) < options["batch_size"]:
+                time.sleep(options["idle_sleep"])
+
 # views.py
 from django.utils.translation import gettext_lazy as _
 from rest_framework.filters import SearchFilter
@@ -69,8 +239,12 @@ class ContactAdminView(views.APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        superuser = User.objects.filter(is_superuser=True, is_staff=True)
-        if not superuser.exists():
+        recipient_list = list(
+            User.objects.filter(is_superuser=True, is_staff=True).values_list(
+                "email", flat=True
+            )
+        )
+        if not recipient_list:
             return Response(
                 data={"message": _(UserConstantsMessage.ADMIN_CREDENTIALS_NOT_FOUND)},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -80,7 +254,7 @@ class ContactAdminView(views.APIView):
             request.data.get("subject"),
             description,
             from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email for user in superuser],
+            recipient_list=recipient_list,
         )
         return Response(
             data={"message": _(UserConstantsMessage.DEFAULT_MAIL_SUCCESS)},
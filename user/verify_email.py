@@ -1,10 +1,266 @@
+# utils.py
+from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
+
+User = get_user_model()
+
+def normalize_email(email: str) -> str:
+    """
+    A function to normalize an email address the way it is stored and
+    indexed: surrounding whitespace removed, lower-cased.
+    """
+    return (email or "").strip().lower()
+
+def users_by_email(email: str):
+    """
+    A function to build the User queryset for an email address. The lookup
+    compares LOWER(email) on non-blank emails, so it is answered by the
+    partial user_email_lower_uniq functional unique index.
+    """
+    return (
+        User.objects.alias(email_lower=Lower("email"))
+        .filter(email_lower=normalize_email(email))
+        .exclude(email="")
+    )
+
+def get_user_by_email(email: str):
+    return users_by_email(email).get()
+
+# bloom.py
+import hashlib
+import math
+import threading
+import time
+
+from django.core.cache import cache
+
+EMAIL_FILTER_CACHE_KEY = "user:email_bloom"
+EMAIL_FILTER_RECENT_KEY = "user:email_bloom:recent"
+EMAIL_FILTER_RECENT_LOCK_KEY = "user:email_bloom:recent:lock"
+EMAIL_FILTER_REFRESH = 300
+EMAIL_FILTER_REBUILD_INTERVAL = 60 * 60
+EMAIL_FILTER_ERROR_RATE = 0.01
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. `in` never misses an added value
+    and wrongly reports a missing one with roughly `error_rate` probability.
+    """
+
+    def __init__(self, size: int, hashes: int, bits=None):
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray(bits) if bits else bytearray((size + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate=EMAIL_FILTER_ERROR_RATE):
+        capacity = max(capacity, 1)
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return cls(size, hashes)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self.bits[position // 8] & (1 << (position % 8))
+            for position in self._positions(value)
+        )
+
+    def dump(self) -> dict:
+        return {"size": self.size, "hashes": self.hashes, "bits": bytes(self.bits)}
+
+class RegisteredEmailFilter:
+    """
+    Process-local copy of the registered, verified email Bloom filter. The
+    filter is built by the rebuild_email_filter command and shared through
+    the cache; emails verified since the last rebuild are tracked in one
+    cache entry so a negative answer is never wrong.
+    """
+
+    def __init__(self):
+        self._filter = None
+        self._loaded = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if (
+                self._loaded is None
+                or time.monotonic() - self._loaded >= EMAIL_FILTER_REFRESH
+            ):
+                dumped = cache.get(EMAIL_FILTER_CACHE_KEY)
+                self._filter = BloomFilter(**dumped) if dumped else None
+                self._loaded = time.monotonic()
+            return self._filter
+
+    def rebuild(self) -> int:
+        queryset = User.objects.filter(is_verified=True).exclude(email__isnull=True)
+        bloom = BloomFilter.for_capacity(queryset.count())
+        added = 0
+        for email in queryset.values_list("email", flat=True).iterator(
+            chunk_size=5000
+        ):
+            bloom.add(normalize_email(email))
+            added += 1
+        cache.set(EMAIL_FILTER_CACHE_KEY, bloom.dump(), timeout=None)
+        with self._lock:
+            self._filter = bloom
+            self._loaded = time.monotonic()
+        return added
+
+    def add(self, email: str) -> None:
+        email = normalize_email(email)
+        self._remember_recent(email)
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(email)
+
+    def _remember_recent(self, email: str) -> None:
+        # {email: verified at}; entries outlive a rebuild so processes still
+        # holding the previous filter keep seeing them
+        locked = False
+        for _ in range(20):
+            locked = cache.add(EMAIL_FILTER_RECENT_LOCK_KEY, True, timeout=5)
+            if locked:
+                break
+            time.sleep(0.05)
+        try:
+            now = time.time()
+            recent = cache.get(EMAIL_FILTER_RECENT_KEY) or {}
+            recent = {
+                value: verified
+                for value, verified in recent.items()
+                if now - verified < EMAIL_FILTER_REBUILD_INTERVAL * 2
+            }
+            recent[email] = now
+            cache.set(EMAIL_FILTER_RECENT_KEY, recent, timeout=None)
+        finally:
+            if locked:
+                cache.delete(EMAIL_FILTER_RECENT_LOCK_KEY)
+
+    def maybe_registered(self, emails) -> set:
+        """
+        Emails that may belong to a verified user and need a database check.
+        Without a built filter every email does.
+        """
+        bloom = self.get()
+        if bloom is None:
+            return set(emails)
+        recent = cache.get(EMAIL_FILTER_RECENT_KEY) or {}
+        return {email for email in emails if email in bloom or email in recent}
+
+registered_email_filter = RegisteredEmailFilter()
+
+# signals.py
+from django.db.models.signals import post_init, post_save, pre_save
+from django.dispatch import receiver
+
+@receiver(pre_save, sender=User)
+def store_normalized_email(sender, instance, **kwargs):
+    if instance.email:
+        instance.email = normalize_email(instance.email)
+
+@receiver(post_init, sender=User)
+def remember_verified_email(sender, instance, **kwargs):
+    if not {"email", "is_verified"} & instance.get_deferred_fields():
+        instance._saved_verified_email = (instance.email, instance.is_verified)
+
+@receiver(post_save, sender=User)
+def add_verified_email_to_filter(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    # logins save last_login only, so they never reach the filter
+    if update_fields is not None and not {"email", "is_verified"} & set(
+        update_fields
+    ):
+        return
+
+    verified_email = (instance.email, instance.is_verified)
+    saved = getattr(instance, "_saved_verified_email", None)
+    if not created and saved == verified_email:
+        return
+    instance._saved_verified_email = verified_email
+
+    if instance.email and instance.is_verified:
+        registered_email_filter.add(instance.email)
+
+# management/commands/rebuild_email_filter.py
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Bloom filter of registered, verified user emails."
+
+    def handle(self, *args, **options):
+        added = registered_email_filter.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Added {added} emails to the filter."))
+
+# management/commands/normalize_user_emails.py
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.db.models.functions import Trim
+
+# users without an email share the blank value, so they stay out of the index
+USER_EMAIL_INDEX_SQL = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS user_email_lower_uniq "
+    "ON {table} (LOWER(email)) WHERE email <> ''"
+)
+
+
+class Command(BaseCommand):
+    help = "Normalize stored user emails and create the LOWER(email) unique index."
+
+    def handle(self, *args, **options):
+        normalized = Lower(Trim("email"))
+        duplicates = list(
+            User.objects.exclude(email__isnull=True)
+            .exclude(email="")
+            .annotate(normalized=normalized)
+            .values("normalized")
+            .annotate(total=Count("id"))
+            .filter(total__gt=1)
+            .values_list("normalized", flat=True)
+            .order_by()
+        )
+        if duplicates:
+            self.stderr.write(
+                "Resolve these emails registered more than once first: "
+                + ", ".join(duplicates)
+            )
+            return
+
+        updated = (
+            User.objects.exclude(email__isnull=True)
+            .exclude(email=normalized)
+            .update(email=normalized)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                USER_EMAIL_INDEX_SQL.format(
+                    table=connection.ops.quote_name(User._meta.db_table)
+                )
+            )
+        self.stdout.write(self.style.SUCCESS(f"Normalized {updated} user emails."))
+
 # views.py
 from django.utils.translation import gettext_lazy as _
 from rest_framework import views, status
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 
-from django.contrib.auth import get_user_model
-User = get_user_model()
+EMAIL_BATCH_MAX_ITEMS = 50000
+EMAIL_BATCH_CHUNK_SIZE = 1000
 
 class GeneralConstantsMessage:
     EMAIL_REQUIRED_ERROR = "Email address required!"
@@ -14,6 +270,31 @@ class UserConstantsMessage:
     EMAIL_IS_NOT_AVAILABLE_TO_CREATE_USER = (
         "This email is available to register a new user."
     )
+    EMAILS_LIST_REQUIRED = "A list of email addresses is required."
+    EMAILS_MUST_BE_STRINGS = "Every email address must be a string."
+    EMAILS_LIMIT_EXCEEDED = (
+        f"A batch can contain at most {EMAIL_BATCH_MAX_ITEMS} email addresses."
+    )
+
+def registered_emails(emails) -> set:
+    """
+    A function to find which normalized emails belong to verified users,
+    with one IN query per chunk for the emails the Bloom filter cannot rule
+    out.
+    """
+    candidates = sorted(registered_email_filter.maybe_registered(emails))
+    registered = set()
+    for start in range(0, len(candidates), EMAIL_BATCH_CHUNK_SIZE):
+        registered.update(
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(
+                email_lower__in=candidates[start : start + EMAIL_BATCH_CHUNK_SIZE],
+                is_verified=True,
+            )
+            .exclude(email="")
+            .values_list("email_lower", flat=True)
+        )
+    return registered
 
 class VerifyEmailView(views.APIView):
     def post(self, request):
@@ -23,9 +304,9 @@ class VerifyEmailView(views.APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user = User.objects.filter(email=request.data.get("email").lower())
+        user = users_by_email(request.data.get("email")).only("is_verified").first()
 
-        if user.exists() and user.first().is_verified:
+        if user and user.is_verified:
             return Response(
                 {"message": GeneralConstantsMessage.USER_ALREADY_EXISTS},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -39,6 +320,46 @@ class VerifyEmailView(views.APIView):
             status=status.HTTP_200_OK,
         )
 
+class VerifyEmailBatchView(views.APIView):
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        emails = request.data.get("emails") if isinstance(request.data, dict) else None
+        if not isinstance(emails, list) or not emails:
+            return Response(
+                {"message": UserConstantsMessage.EMAILS_LIST_REQUIRED},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(emails) > EMAIL_BATCH_MAX_ITEMS:
+            return Response(
+                {"message": UserConstantsMessage.EMAILS_LIMIT_EXCEEDED},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not all(isinstance(email, str) for email in emails):
+            return Response(
+                {"message": UserConstantsMessage.EMAILS_MUST_BE_STRINGS},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        normalized = {email: normalize_email(email) for email in emails}
+        registered = registered_emails(
+            {value for value in normalized.values() if value}
+        )
+        return Response(
+            {
+                "data": [
+                    {
+                        "email": email,
+                        "available": bool(value) and value not in registered,
+                    }
+                    for email, value in normalized.items()
+                ]
+            },
+            status=status.HTTP_200_OK,
+        )
+
 # urls.py
 from django.urls import path
 path("verify-email/", VerifyEmailView.as_view(), name="verify-email"),
+path("verify-email/batch/", VerifyEmailBatchView.as_view(), name="verify-email-batch"),